@@ -0,0 +1,2 @@
+# aoc2024/aoc2024/__init__.py
+# Shared tooling for running the daily solutions
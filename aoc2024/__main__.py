@@ -0,0 +1,66 @@
+# aoc2024/aoc2024/__main__.py
+# Single entry point: python -m aoc2024 run|bench --days 1-5 ...
+
+import argparse
+import sys
+from pathlib import Path
+
+from aoc2024.bench import benchmark
+from aoc2024.cache import CACHE_DIR, MAX_ENTRIES, ResultCache
+from aoc2024.registry import ROOT, discover_days, parse_days
+from aoc2024.runner import run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m aoc2024")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    run_parser = commands.add_parser("run", help="Run the selected days and parts in parallel")
+    run_parser.add_argument("-d", "--days", help="Days to run, e.g. '1-3,5' (default: all)")
+    run_parser.add_argument("-w", "--workers", type=int, help="Number of worker processes (default: CPU count)")
+    run_parser.add_argument("-i", "--input-dir", type=Path, default=ROOT, help="Directory holding dayNN/input.txt (default: the repository root)")
+    run_parser.add_argument("-s", "--separate", action="store_true", help="Run part 1 and part 2 of each day separately instead of through its solve_both")
+    run_parser.add_argument("--no-cache", action="store_true", help="Recompute every answer instead of reading the answer cache")
+    run_parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="Where cached answers are stored")
+    run_parser.add_argument("--cache-size", type=int, default=MAX_ENTRIES, help="Answers kept before the least recently used are evicted")
+    run_parser.add_argument("--profile", nargs="?", const=Path("profiles"), type=Path, metavar="DIR", help="Write a cProfile dump per run to DIR (default: profiles), viewable with pstats: dayNN.prof, or dayNN_partP.prof with --separate")
+    run_parser.add_argument("--trace-memory", action="store_true", help="Report the peak tracemalloc usage of each phase")
+    run_parser.add_argument("--report", type=Path, help="Write the phase timings of every run as JSON (default with --profile/--trace-memory: profile_report.json)")
+    
+    bench_parser = commands.add_parser("bench", help="Benchmark the selected days on synthetic inputs")
+    bench_parser.add_argument("-d", "--days", help="Days to benchmark, e.g. '1-3,5' (default: all)")
+    bench_parser.add_argument("-s", "--sizes", default="1e3,1e4,1e5", help="Comma-separated input sizes in elements, e.g. '1e3,1e6'")
+    bench_parser.add_argument("-r", "--repeats", type=int, default=3, help="Timed runs per measurement")
+    bench_parser.add_argument("--seed", type=int, default=0, help="Seed for the input generators")
+    bench_parser.add_argument("-o", "--output", type=Path, default=Path("bench_output.txt"), help="Where to write the JSON lines results")
+    bench_parser.add_argument("-b", "--baseline", type=Path, help="Previous results file to flag regressions against")
+    bench_parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative slowdown against the baseline")
+    args = parser.parse_args()
+    
+    available = discover_days()
+    try:
+        days = parse_days(args.days, available) if args.days else list(available)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if args.command == "run":
+        profiling = args.profile or args.trace_memory or args.report
+        report = args.report
+        if profiling and report is None:
+            report = Path("profile_report.json")
+        # a cached answer has nothing to profile
+        cache = (None if args.no_cache or profiling else
+                 ResultCache(args.cache_dir, args.cache_size))
+        run(days, args.input_dir, args.workers, cache, args.trace_memory,
+            args.profile, report, args.separate)
+    elif args.command == "bench":
+        sizes = [int(float(size)) for size in args.sizes.split(",")]
+        if not benchmark(days, sizes, args.repeats, args.seed, args.output,
+                         args.baseline, args.threshold):
+            sys.exit(1)
+    
+    return
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# aoc2024/aoc2024/bench.py
+# Benchmarks every part on seeded synthetic inputs of configurable size
+
+import json
+import math
+import random
+import time
+import tracemalloc
+from pathlib import Path
+
+from aoc2024.registry import PARTS, get_part
+
+
+# Pieces of day 3 corrupted memory; valid instructions mixed with near misses
+MEMORY_FRAGMENTS = ["mul(", "do()", "don't()", "mul(2,4)", "mul(123,456)",
+                    "mul[3,7]", "mul(32,64]", "don't(", "do(", "1", "23",
+                    "456", "7890", ",", ")", "x", "%", "&", " ", "why()",
+                    "select()"]
+
+
+def generate_memory(lines: int, fragments_per_line: int,
+                    rng: random.Random) -> list[str]:
+    """Day 3 corrupted memory: 'lines' lines of 'fragments_per_line' random
+    MEMORY_FRAGMENTS each."""
+    return ["".join(rng.choices(MEMORY_FRAGMENTS, k=fragments_per_line))
+            for _ in range(lines)]
+
+
+def generate_day01(size: int, rng: random.Random) -> list[str]:
+    """'size' pairs of 5-digit location IDs."""
+    return [f"{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}"
+            for _ in range(size)]
+
+
+def generate_day02(size: int, rng: random.Random) -> list[str]:
+    """About 'size' levels, in reports of 5 to 8 mostly monotonic levels."""
+    reports = []
+    levels_left = size
+    while levels_left > 0:
+        level = rng.randint(1, 99)
+        direction = rng.choice((1, -1))
+        report = [level]
+        for _ in range(min(rng.randint(5, 8), levels_left) - 1):
+            level += direction * rng.choice((1, 2, 3, 1, 2, 3, 0, 4, -1))
+            report.append(level)
+        reports.append(" ".join(map(str, report)))
+        levels_left -= len(report)
+    return reports
+
+
+def generate_day03(size: int, rng: random.Random) -> list[str]:
+    """About 'size' characters of corrupted memory, in lines of about 3000."""
+    return generate_memory(max(1, size // 3000),
+                           max(1, min(size, 3000) // 4), rng)
+
+
+def generate_day04(size: int, rng: random.Random) -> list[str]:
+    """A square grid of about 'size' letters."""
+    side = max(1, math.isqrt(size))
+    return ["".join(rng.choices("XMAS", k=side)) for _ in range(side)]
+
+
+def generate_day05(size: int, rng: random.Random) -> list[str]:
+    """Rules totally ordering 49 pages, then updates of about 'size' pages in
+    total, about half of them already in order."""
+    pages = rng.sample(range(10, 100), 49)
+    rules = [f"{pages[i]}|{pages[j]}"
+             for i in range(len(pages)) for j in range(i + 1, len(pages))]
+    rng.shuffle(rules)
+    
+    updates = []
+    pages_left = size
+    while pages_left > 0:
+        update = rng.sample(pages, rng.choice((5, 7, 9, 11, 13, 21)))
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(",".join(map(str, update)))
+        pages_left -= len(update)
+    return rules + [""] + updates
+
+
+GENERATORS = {1: generate_day01, 2: generate_day02, 3: generate_day03,
+              4: generate_day04, 5: generate_day05}
+
+
+def measure(part_function, text: list[str], repeats: int) -> dict:
+    """Times 'repeats' runs of part_function(text), then measures its peak
+    memory in one more run under tracemalloc, which would skew the timings.
+
+    Args:
+        part_function (Callable[[list[str]], int]): The part to measure.
+        text (list[str]): The input as a list of its lines.
+        repeats (int): The number of timed runs.
+
+    Returns:
+        dict: The answer, best and mean seconds, and peak bytes.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        answer = part_function(text)
+        times.append(time.perf_counter() - start)
+    
+    tracemalloc.start()
+    part_function(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"answer": answer, "best_seconds": min(times),
+            "mean_seconds": sum(times) / len(times), "peak_bytes": peak}
+
+
+def load_results(path: Path) -> dict[tuple[int, int, int], dict]:
+    """Reads a results file written by benchmark, keyed by (day, part, size)."""
+    results = {}
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                results[(record["day"], record["part"], record["size"])] = record
+    return results
+
+
+def benchmark(days: list[int], sizes: list[int], repeats: int = 3,
+              seed: int = 0, output: Path = Path("bench_output.txt"),
+              baseline: Path | None = None, threshold: float = 0.1) -> bool:
+    """Benchmarks every part of every selected day at every size, prints a
+    line per measurement and writes them as JSON lines to 'output'. With a
+    'baseline' results file, flags every measurement whose best time grew by
+    more than 'threshold'.
+
+    Args:
+        days (list[int]): The selected days.
+        sizes (list[int]): The input sizes, in elements (pairs, levels,
+        characters, grid cells or update pages, depending on the day).
+        repeats (int): The number of timed runs per measurement.
+        seed (int): Seed for the input generators.
+        output (Path): Where the JSON lines are written.
+        baseline (Path | None): A previous 'output' to compare against.
+        threshold (float): Allowed relative slowdown against the baseline.
+
+    Returns:
+        bool: True if no regression was found.
+    """
+    baseline_results = load_results(baseline) if baseline else {}
+    regressions = 0
+    with open(output, "w") as f:
+        for day in days:
+            for size in sizes:
+                text = GENERATORS[day](size, random.Random(seed))
+                for part in PARTS:
+                    record = {"day": day, "part": part, "size": size,
+                              "seed": seed, "repeats": repeats}
+                    record.update(measure(get_part(day, part), text, repeats))
+                    f.write(json.dumps(record) + "\n")
+                    
+                    summary = (f"Day {day:02d} part {part} size {size}: "
+                               f"best {record['best_seconds']:.4f}s, "
+                               f"mean {record['mean_seconds']:.4f}s, "
+                               f"peak {record['peak_bytes'] / 2**20:.1f} MiB")
+                    previous = baseline_results.get((day, part, size))
+                    if previous:
+                        ratio = record["best_seconds"] / previous["best_seconds"]
+                        summary += f", {ratio:.2f}x baseline"
+                        if ratio > 1 + threshold:
+                            summary += " REGRESSION"
+                            regressions += 1
+                    print(summary)
+    
+    if baseline_results:
+        print(f"{regressions} regression(s) against '{baseline}'.")
+    return not regressions
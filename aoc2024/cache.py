@@ -0,0 +1,147 @@
+# aoc2024/aoc2024/cache.py
+# On-disk answer cache keyed on the input bytes and the solution's source
+
+import ast
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from aoc2024.registry import ROOT
+
+
+CACHE_DIR = ROOT / ".aoc_cache"
+
+# Where the shared aoc2024 modules the solutions import live
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+# Answers kept before the least recently used ones are evicted
+MAX_ENTRIES = 1024
+
+
+def file_digest(path: Path) -> str:
+    """Returns the SHA-256 hex digest of the file at 'path'."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def package_imports(path: Path) -> set[Path]:
+    """Returns the paths of the aoc2024 modules the source at 'path' imports
+    directly, as "from aoc2024 import x", "from aoc2024.x import ..." or
+    "import aoc2024.x".
+    """
+    names = []
+    for node in ast.walk(ast.parse(Path(path).read_bytes())):
+        if isinstance(node, ast.ImportFrom) and node.module == "aoc2024":
+            names.extend(f"aoc2024.{alias.name}" for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.append(node.module)
+        elif isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+    modules = {name.split(".")[1] for name in names
+               if name.startswith("aoc2024.")}
+    return {PACKAGE_DIR / f"{module}.py" for module in modules
+            if (PACKAGE_DIR / f"{module}.py").is_file()}
+
+
+def solution_digest(path: Path) -> str:
+    """Returns a SHA-256 hex digest of the solution at 'path' together with
+    every aoc2024 module it imports, directly or through other aoc2024
+    modules, so editing e.g. loader.py changes it too.
+
+    Args:
+        path (Path): Path to the day's solution.py.
+
+    Returns:
+        str: The digest.
+    """
+    modules: set[Path] = set()
+    pending = [Path(path)]
+    while pending:
+        for module in package_imports(pending.pop()) - modules:
+            modules.add(module)
+            pending.append(module)
+    
+    digest = hashlib.sha256(file_digest(path).encode())
+    for module in sorted(modules):
+        digest.update(f":{module.name}={file_digest(module)}".encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Content-addressed cache of part answers. An answer's key hashes the
+    input's bytes together with the day's solution.py source and the aoc2024
+    modules it imports, so editing any of them or the input leaves old
+    entries unreachable instead of stale.
+    Each answer is one small JSON file whose mtime is bumped on every hit,
+    and the oldest files are evicted past 'max_entries'.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR,
+                 max_entries: int = MAX_ENTRIES) -> None:
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(input_digest: str, source_digest: str, part: int) -> str:
+        """Combines the digests of an input and a solution source, and the
+        part number, into one cache key.
+
+        Args:
+            input_digest (str): The file_digest of the input.
+            source_digest (str): The solution_digest of the day's
+            solution.py.
+            part (int): 1 or 2.
+
+        Returns:
+            str: The cache key.
+        """
+        return hashlib.sha256(
+            f"{input_digest}:{source_digest}:{part}".encode()
+        ).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str):
+        """Returns the cached answer for 'key', or None on a miss.
+
+        Args:
+            key (str): A key from ResultCache.key.
+
+        Returns:
+            int | None: The cached answer.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                answer = json.load(f)["answer"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            self.misses += 1
+            return None
+        
+        os.utime(path)
+        self.hits += 1
+        return answer
+
+    def put(self, key: str, answer) -> None:
+        """Stores the answer for 'key', then evicts the least recently used
+        answers past 'max_entries'.
+
+        Args:
+            key (str): A key from ResultCache.key.
+            answer (int): The part's answer.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "w") as f:
+            json.dump({"answer": answer}, f)
+        os.replace(temp_path, path)
+        
+        entries = sorted(self.directory.glob("*.json"),
+                         key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:max(0, len(entries) - self.max_entries)]:
+            entry.unlink(missing_ok=True)
@@ -0,0 +1,87 @@
+# aoc2024/aoc2024/loader.py
+# Shared input loading for every day, in three modes
+
+import mmap
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+def read_lines(path: str) -> list[str]:
+    """Reads the whole file at 'path' in one read() and splits it into lines,
+    instead of appending one line at a time.
+
+    Args:
+        path (str): Path to the input file.
+
+    Returns:
+        list[str]: The input as a list of its lines, without trailing
+        whitespace (like iter_lines).
+    """
+    with open(path, "r") as f:
+        return [line.rstrip() for line in f.read().splitlines()]
+
+
+def iter_lines(path: str) -> Iterator[str]:
+    """Lazily yields the lines of the file at 'path', for solutions that can
+    consume their input as a stream.
+
+    Args:
+        path (str): Path to the input file.
+
+    Yields:
+        str: The next line, without trailing whitespace.
+    """
+    with open(path, "r") as f:
+        for line in f:
+            yield line.rstrip()
+
+
+@contextmanager
+def map_bytes(path: str) -> Iterator[mmap.mmap | bytes]:
+    """Maps the file at 'path' read-only, for solutions that work on raw
+    bytes. Slicing or searching the map reads straight from the page cache,
+    and nothing is copied up front.
+
+    Args:
+        path (str): Path to the input file.
+
+    Yields:
+        mmap.mmap | bytes: The file's bytes (b"" for an empty file, which
+        cannot be mapped).
+    """
+    with open(path, "rb") as f:
+        if not f.seek(0, 2):
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as memory:
+            yield memory
+
+
+def iter_blocks(memory: mmap.mmap | bytes, start: int = 0,
+                stop: int | None = None,
+                block_size: int = 1 << 24) -> Iterator[bytes]:
+    """Yields bytes [start, stop) of 'memory' as blocks of about 'block_size'
+    bytes that each end on a line boundary, so no line is split across
+    blocks. 'start' must be the start of a line.
+
+    Args:
+        memory (mmap.mmap | bytes): The bytes from map_bytes.
+        start (int): Offset of the first byte.
+        stop (int | None): Offset just past the last byte (default: the end).
+        block_size (int): Rough number of bytes per block.
+
+    Yields:
+        bytes: The next block of whole lines.
+    """
+    stop = len(memory) if stop is None else stop
+    while start < stop:
+        end = start + block_size
+        if end >= stop:
+            end = stop
+        else:
+            # cut after the last newline, or after the first one past a
+            # line longer than the block
+            end = (memory.rfind(b"\n", start, end) + 1 or
+                   memory.find(b"\n", end, stop) + 1 or stop)
+        yield memory[start:end]
+        start = end
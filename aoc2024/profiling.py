@@ -0,0 +1,105 @@
+# aoc2024/aoc2024/profiling.py
+# Phase timing spans inside the parts, recorded only while profiling is on
+
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+
+
+# What span() returns while nothing is recording: a reusable no-op
+_NULL_SPAN = nullcontext()
+
+# The active Recorder, or None when profiling is off
+_recorder = None
+
+
+class Recorder:
+    """Collects the wall time and, optionally, the peak traced memory of each
+    named phase. Nested spans are recorded as "outer/inner", and repeated
+    spans of the same name are merged.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.phases: dict[str, dict] = {}
+        self._stack: list[list] = []
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Records the phase 'name' while the block runs."""
+        if self._stack:
+            name = f"{self._stack[-1][0]}/{name}"
+        if self.trace_memory:
+            # the peak is reset per span, so hand the peak so far to the
+            # enclosing span first
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+            tracemalloc.reset_peak()
+        else:
+            current = 0
+        frame = [name, current]
+        self._stack.append(frame)
+        phase = self.phases.setdefault(
+            name, {"name": name, "calls": 0, "seconds": 0.0}
+        )
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            phase["calls"] += 1
+            phase["seconds"] += seconds
+            if self.trace_memory:
+                peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+                phase["peak_bytes"] = max(phase.get("peak_bytes", 0),
+                                          peak - current)
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+
+    def report(self) -> list[dict]:
+        """Returns the recorded phases, in the order they were first entered."""
+        return list(self.phases.values())
+
+
+def span(name: str):
+    """Marks a phase of a part, e.g. with span("parse"): ... Costs one
+    function call while no Recorder is active.
+
+    Args:
+        name (str): The phase name, e.g. "parse", "solve" or "sort".
+
+    Returns:
+        ContextManager[None]: The span.
+    """
+    if _recorder is None:
+        return _NULL_SPAN
+    return _recorder.span(name)
+
+
+@contextmanager
+def recording(trace_memory: bool = False) -> Iterator[Recorder]:
+    """Activates a Recorder for the spans run inside the block.
+
+    Args:
+        trace_memory (bool): Also trace the peak memory of each phase with
+        tracemalloc, which slows everything down.
+
+    Yields:
+        Recorder: The active recorder.
+    """
+    global _recorder
+    previous = _recorder
+    _recorder = Recorder(trace_memory)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        yield _recorder
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        _recorder = previous
@@ -0,0 +1,108 @@
+# aoc2024/aoc2024/registry.py
+# Lazy registry of the daily solutions
+
+import importlib
+import re
+import sys
+from pathlib import Path
+from types import ModuleType
+
+
+# Repository root, which holds one dayNN/solution.py per day
+ROOT = Path(__file__).resolve().parent.parent
+
+PARTS = (1, 2)
+
+
+def discover_days(root: Path = ROOT) -> dict[int, str]:
+    """Finds every dayNN/solution.py under 'root' without importing any.
+
+    Args:
+        root (Path): The repository root.
+
+    Returns:
+        dict[int, str]: The module name of each day, e.g. {1: "day01.solution"}.
+    """
+    days = {}
+    for path in root.glob("day*/solution.py"):
+        match = re.fullmatch(r"day(\d+)", path.parent.name)
+        if match:
+            days[int(match[1])] = f"{path.parent.name}.solution"
+    return dict(sorted(days.items()))
+
+
+def parse_days(spec: str, available: dict[int, str]) -> list[int]:
+    """Parses a day selection such as "1-3,5" against the available days.
+
+    Args:
+        spec (str): Comma-separated days and inclusive day ranges.
+        available (dict[int, str]): The days from discover_days.
+
+    Returns:
+        list[int]: The selected days, sorted.
+
+    Raises:
+        ValueError: If the selection is malformed or names a missing day.
+    """
+    days = set()
+    for item in spec.split(","):
+        first, _, last = item.strip().partition("-")
+        days.update(range(int(first), int(last or first) + 1))
+    
+    missing = days - available.keys()
+    if missing:
+        raise ValueError(f"no solution for day(s) {sorted(missing)}")
+    return sorted(days)
+
+
+def solution_path(day: int) -> Path:
+    """Returns the path of the solution.py of 'day', without importing it."""
+    return ROOT / discover_days()[day].partition(".")[0] / "solution.py"
+
+
+def load_solution(day: int) -> ModuleType:
+    """Imports the solution module of 'day', only when it is first needed.
+
+    Args:
+        day (int): The day number.
+
+    Returns:
+        ModuleType: The dayNN.solution module.
+    """
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    return importlib.import_module(discover_days()[day])
+
+
+def get_part(day: int, part: int):
+    """Returns the part_1 or part_2 function of 'day'.
+
+    Args:
+        day (int): The day number.
+        part (int): 1 or 2.
+
+    Returns:
+        Callable[[list[str]], int]: The part function.
+    """
+    return getattr(load_solution(day), f"part_{part}")
+
+
+def get_solver(day: int, parts: tuple[int, ...] = PARTS):
+    """Returns a function answering 'parts' of 'day' from one input. For both
+    parts, that is the day's solve_both, which parses the input once; days
+    without one fall back to running each part in turn.
+
+    Args:
+        day (int): The day number.
+        parts (tuple[int, ...]): The parts to answer, in order.
+
+    Returns:
+        Callable[[list[str]], tuple[int, ...]]: The solver.
+    """
+    solve_both = getattr(load_solution(day), "solve_both", None)
+    if tuple(parts) == PARTS and solve_both is not None:
+        return solve_both
+    
+    part_functions = [get_part(day, part) for part in parts]
+    return lambda text: tuple(part_function(text)
+                              for part_function in part_functions)
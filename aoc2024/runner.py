@@ -0,0 +1,168 @@
+# aoc2024/aoc2024/runner.py
+# Runs the selected days and parts in parallel in a process pool
+
+import cProfile
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+from aoc2024 import loader, profiling
+from aoc2024.cache import ResultCache, file_digest, solution_digest
+from aoc2024.registry import PARTS, get_solver, solution_path
+
+
+def input_path(input_dir: Path, day: int) -> Path:
+    """Returns where the input of 'day' lives: <input_dir>/dayNN/input.txt."""
+    return Path(input_dir) / f"day{day:02d}" / "input.txt"
+
+
+def run_parts(day: int, parts: tuple[int, ...], path: Path,
+              record: bool = False, trace_memory: bool = False,
+              profile_dir: Path | None = None) -> tuple:
+    """Reads the input at 'path' and times 'parts' of one day, together when
+    that is both parts (see get_solver). Runs in a worker process, which
+    imports the day's module on first use.
+
+    Args:
+        day (int): The day number.
+        parts (tuple[int, ...]): The parts to answer.
+        path (Path): Path to the day's input file.
+        record (bool): Record the phase spans.
+        trace_memory (bool): Also record the peak traced memory per phase.
+        profile_dir (Path | None): Where to write a cProfile dump of the run,
+        as dayNN.prof (or dayNN_partP.prof for one part), or None to not
+        profile it.
+
+    Returns:
+        tuple[int, tuple[int, ...], tuple[int, ...], float, list[dict] | None]:
+        The day, the parts, their answers, their wall time in seconds and
+        their phases (None if not recorded).
+    """
+    solver = get_solver(day, parts)
+    file_lines = loader.read_lines(path)
+    
+    recording = (profiling.recording(trace_memory) if record or trace_memory
+                 else nullcontext())
+    profiler = cProfile.Profile() if profile_dir is not None else None
+    with recording as recorder:
+        if profiler is not None:
+            profiler.enable()
+        start = time.perf_counter()
+        answers = tuple(solver(file_lines))
+        seconds = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+    
+    if profiler is not None:
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        suffix = "".join(f"_part{part}" for part in parts if parts != PARTS)
+        profiler.dump_stats(profile_dir / f"day{day:02d}{suffix}.prof")
+    phases = None if recorder is None else recorder.report()
+    return (day, parts, answers, seconds, phases)
+
+
+def write_report(results: list[tuple], total_seconds: float,
+                 path: Path) -> None:
+    """Writes the timings and phases of every run_parts call as JSON.
+
+    Args:
+        results (list[tuple]): The run_parts results.
+        total_seconds (float): The wall time of the whole run.
+        path (Path): Where the report is written.
+    """
+    runs = [{"day": day, "parts": list(parts), "answers": list(answers),
+             "seconds": seconds, "phases": phases}
+            for day, parts, answers, seconds, phases in results]
+    with open(path, "w") as f:
+        json.dump({"runs": runs, "total_seconds": total_seconds}, f,
+                  indent=2)
+        f.write("\n")
+
+
+def run(days: list[int], input_dir: Path, workers: int | None = None,
+        cache: ResultCache | None = None, trace_memory: bool = False,
+        profile_dir: Path | None = None, report: Path | None = None,
+        separate: bool = False) -> None:
+    """Runs every selected day at the same time on a process pool and prints
+    the answers with their wall times. Both parts of a day are answered
+    together by its solve_both, unless 'separate' is set. Answers found in
+    'cache' are printed without running anything.
+
+    Args:
+        days (list[int]): The selected days.
+        input_dir (Path): Directory holding the dayNN/input.txt files.
+        workers (int | None): Size of the process pool (default: CPU count).
+        cache (ResultCache | None): Answer cache, or None to always run.
+        trace_memory (bool): Report the peak traced memory of each phase.
+        profile_dir (Path | None): Where to write a cProfile dump per run, or
+        None to not profile.
+        report (Path | None): Where to write the JSON report of the phases
+        of every run, or None to not record them.
+        separate (bool): Run part_1 and part_2 separately, as two runs.
+    """
+    start = time.perf_counter()
+    results = []
+    keys = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for day in days:
+            path = input_path(input_dir, day)
+            if not path.is_file():
+                print(f"Day {day:02d}: '{path}' does not exist.")
+                continue
+            
+            parts = PARTS
+            if cache is not None:
+                input_digest = file_digest(path)
+                source_digest = solution_digest(solution_path(day))
+                parts = []
+                for part in PARTS:
+                    keys[day, part] = cache.key(input_digest, source_digest,
+                                                part)
+                    answer = cache.get(keys[day, part])
+                    if answer is not None:
+                        results.append((day, (part,), (answer,), None, None))
+                    else:
+                        parts.append(part)
+            
+            runs = [(part,) for part in parts] if separate else [tuple(parts)]
+            for run_parts_of_day in runs:
+                if run_parts_of_day:
+                    futures.append(executor.submit(
+                        run_parts, day, run_parts_of_day, path,
+                        report is not None, trace_memory, profile_dir
+                    ))
+        
+        for future in futures:
+            result = future.result()
+            if cache is not None:
+                for part, answer in zip(result[1], result[2]):
+                    cache.put(keys[result[0], part], answer)
+            results.append(result)
+    
+    results.sort(key=lambda result: (result[0], result[1]))
+    for day, parts, answers, seconds, phases in results:
+        if seconds is None:
+            timing = "cached"
+        elif len(parts) > 1:
+            timing = f"{seconds:.4f}s for parts {'+'.join(map(str, parts))}"
+        else:
+            timing = f"{seconds:.4f}s"
+        for part, answer in zip(parts, answers):
+            print(f"Day {day:02d} part {part}: {answer} ({timing})")
+        for phase in phases or ():
+            memory = (f", peak {phase['peak_bytes'] / 2**20:.2f} MiB"
+                      if "peak_bytes" in phase else "")
+            print(f"    {phase['name']}: {phase['seconds']:.4f}s{memory}")
+    if cache is not None:
+        print(f"Cache: {cache.hits} hits, {cache.misses} misses")
+    total_seconds = time.perf_counter() - start
+    print(f"Total wall time: {total_seconds:.4f}s")
+    
+    if report is not None:
+        write_report(results, total_seconds, report)
+        print(f"Report written to '{report}'")
+    if profile_dir is not None:
+        print(f"Profiles written to '{profile_dir}'")
@@ -0,0 +1,148 @@
+# aoc2024/aoc2024/snapshot.py
+# Binary snapshots of parsed inputs, memory-mapped back instead of re-parsed
+
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Callable
+from pathlib import Path
+
+from aoc2024.cache import file_digest
+
+
+MAGIC = b"AOCSNAP1"
+
+# Header: magic, SHA-256 of the input, number of buffers
+HEADER = struct.Struct("<8s32sQ")
+
+# One per buffer: typecode (padded to 8 bytes), number of items
+BUFFER_HEADER = struct.Struct("<8sQ")
+
+# Array typecodes a memoryview can be cast to
+TYPECODES = "bBhHiIlLqQfd"
+
+
+def snapshot_path(input_path: Path, name: str) -> Path:
+    """Returns where the snapshot 'name' of an input lives: next to it, e.g.
+    input.txt.day01.snap.
+    """
+    input_path = Path(input_path)
+    return input_path.with_name(f"{input_path.name}.{name}.snap")
+
+
+def save(path: Path, input_digest: str, buffers: list) -> None:
+    """Writes 'buffers' as a snapshot of the input whose digest is
+    'input_digest'. Every buffer starts on an 8-byte boundary, so it can be
+    cast in place when loaded.
+
+    Args:
+        path (Path): Where the snapshot is written.
+        input_digest (str): The file_digest of the input it was parsed from.
+        buffers (list[array]): The parsed form, as typed arrays.
+    """
+    temp_path = Path(path).with_suffix(".tmp")
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, bytes.fromhex(input_digest), len(buffers)))
+        for buffer in buffers:
+            f.write(BUFFER_HEADER.pack(buffer.typecode.encode(), len(buffer)))
+        for buffer in buffers:
+            f.write(buffer.tobytes())
+            f.write(b"\0" * (-f.tell() % 8))
+    os.replace(temp_path, path)
+
+
+def load(path: Path, input_digest: str) -> list[memoryview] | None:
+    """Memory-maps a snapshot and returns its buffers as typed memoryviews
+    over the map, without copying or parsing anything.
+
+    Args:
+        path (Path): The snapshot to load.
+        input_digest (str): The file_digest of the current input.
+
+    Returns:
+        list[memoryview] | None: The buffers, or None if the snapshot is
+        missing, malformed, or was taken of a different input.
+    """
+    try:
+        with open(path, "rb") as f:
+            memory = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    layout = _read_layout(memory, input_digest)
+    if layout is None:
+        memory.close()
+        return None
+
+    view = memoryview(memory)
+    return [view[offset:offset + size].cast(typecode)
+            for typecode, offset, size in layout]
+
+
+def _read_layout(memory: mmap.mmap,
+                 input_digest: str) -> list[tuple[str, int, int]] | None:
+    """Reads and checks a snapshot's headers against its size.
+
+    Args:
+        memory (mmap.mmap): The mapped snapshot.
+        input_digest (str): The file_digest of the current input.
+
+    Returns:
+        list[tuple[str, int, int]] | None: The typecode, offset and size in
+        bytes of each buffer, or None if the snapshot is malformed, truncated
+        or was taken of a different input.
+    """
+    if len(memory) < HEADER.size:
+        return None
+    magic, digest, count = HEADER.unpack_from(memory)
+    if magic != MAGIC or digest != bytes.fromhex(input_digest):
+        return None
+
+    offset = HEADER.size + count * BUFFER_HEADER.size
+    if offset > len(memory):
+        return None
+    layout = []
+    for i in range(count):
+        typecode, length = BUFFER_HEADER.unpack_from(
+            memory, HEADER.size + i * BUFFER_HEADER.size
+        )
+        try:
+            typecode = typecode.rstrip(b"\0").decode()
+        except UnicodeDecodeError:
+            return None
+        if len(typecode) != 1 or typecode not in TYPECODES:
+            return None
+        size = length * array(typecode).itemsize
+        if offset + size > len(memory):
+            return None
+        layout.append((typecode, offset, size))
+        offset += size + (-size % 8)
+
+    # the last buffer's padding ends the file
+    if offset != len(memory):
+        return None
+    return layout
+
+
+def load_or_build(input_path: Path, name: str,
+                  build: Callable[[], list]) -> list:
+    """Returns the parsed form of an input from its snapshot, or parses it
+    with 'build' and snapshots the result when the snapshot is missing or
+    the input has changed since.
+
+    Args:
+        input_path (Path): Path to the input file.
+        name (str): Name of the parsed form, e.g. "day01".
+        build (Callable[[], list[array]]): Parses the input into buffers.
+
+    Returns:
+        list[memoryview] | list[array]: The buffers.
+    """
+    input_digest = file_digest(input_path)
+    path = snapshot_path(input_path, name)
+    buffers = load(path, input_digest)
+    if buffers is None:
+        buffers = build()
+        save(path, input_digest, buffers)
+    return buffers
@@ -2,7 +2,42 @@
 # Solution to Advent of Code 2024 Day 1: Historian Hysteria
 
 import argparse
+import heapq
+import os
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import Counter
+from collections.abc import Iterator
+from operator import mul
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Lets the solution run as a script from its own directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc2024 import loader, profiling, snapshot
+
+
+# Largest magnitude an int64 accumulator can hold without overflowing
+INT64_LIMIT = 2**63
+
+# similarity_score_numpy counts IDs in a dense table when their range is
+# at most this many times the number of IDs
+DENSE_SPAN_FACTOR = 4
+
+# Bytes read per bulk chunk in parse_file_to_columns
+CHUNK_SIZE = 1 << 24
+
+# Default peak memory for part_1_external, and the rough cost of one
+# in-memory ID (list slot + int object) used to size its sorted runs
+MEMORY_BUDGET = 1 << 28
+BYTES_PER_ID = 40
+
 
 def parse_input_to_lists(text:list[str]) -> tuple[list[int], list[int]]:
     left_location_ids = []
@@ -14,54 +49,658 @@ def parse_input_to_lists(text:list[str]) -> tuple[list[int], list[int]]:
     return (left_location_ids, right_location_ids)
 
 
-def part_1(text: list[str]) -> int:
+def parse_file_to_columns(path: str,
+                          chunk_size: int = CHUNK_SIZE) -> tuple[array, array]:
+    """Reads the file at 'path' in bulk chunks into two compact int64 columns.
+    The file is memory-mapped and cut into line-aligned chunks, and only one
+    chunk's worth of tokens is alive at a time.
+
+    Args:
+        path (str): Path to the input file.
+        chunk_size (int): Number of bytes read per chunk.
+
+    Returns:
+        tuple[array, array]: The left and right location IDs as array('q').
+    """
+    left_location_ids = array("q")
+    right_location_ids = array("q")
+    with loader.map_bytes(path) as memory:
+        for block in loader.iter_blocks(memory, block_size=chunk_size):
+            ids = block.split()
+            left_location_ids.extend(map(int, ids[0::2]))
+            right_location_ids.extend(map(int, ids[1::2]))
+    return (left_location_ids, right_location_ids)
+
+
+def load_columns(path: str) -> tuple:
+    """Returns the columns of the file at 'path' from its binary snapshot,
+    memory-mapped instead of re-parsed. The snapshot is (re)built with
+    parse_file_to_columns when it is missing or the file has changed.
+
+    Args:
+        path (str): Path to the input file.
+
+    Returns:
+        tuple[memoryview, memoryview]: The left and right location IDs.
+    """
+    return tuple(snapshot.load_or_build(
+        path, "day01", lambda: list(parse_file_to_columns(path))
+    ))
+
+
+def as_columns(text: list[str] | tuple[array, array]) -> tuple:
+    """Returns 'text' as (left, right) columns, parsing it only if it is still
+    a list of lines. Already parsed columns are passed through untouched.
+
+    Args:
+        text (list[str] | tuple[array, array]): The input as a list of its
+        lines, or as columns from parse_file_to_columns/parse_input_to_lists.
+
+    Returns:
+        tuple: The left and right location IDs.
+    """
+    if isinstance(text, tuple):
+        return text
+    return parse_input_to_lists(text)
+
+
+def to_numpy_column(column) -> "np.ndarray":
+    """Converts a location ID column into an int64 NumPy array. array('q')
+    and snapshot columns are wrapped without copying.
+
+    Args:
+        column (list[int] | array | memoryview): The location IDs.
+
+    Returns:
+        np.ndarray: The location IDs as int64.
+    """
+    if (isinstance(column, array) and column.typecode == "q" or
+        isinstance(column, memoryview) and column.format == "q"):
+        return np.frombuffer(column, dtype=np.int64)
+    return np.asarray(column, dtype=np.int64)
+
+
+def total_distance_numpy(left_location_ids, right_location_ids,
+                         is_sorted: bool = False) -> int:
+    """Vectorized part_1: sorts both columns and sums their absolute
+    differences. Falls back to Python ints when the sum could overflow int64.
+
+    Args:
+        left_location_ids (list[int] | array): The left location IDs.
+        right_location_ids (list[int] | array): The right location IDs.
+        is_sorted (bool): Both columns are already sorted int64 arrays.
+
+    Returns:
+        int: The total distance.
+    """
+    left = to_numpy_column(left_location_ids)
+    right = to_numpy_column(right_location_ids)
+    if not is_sorted:
+        left = np.sort(left)
+        right = np.sort(right)
+    if left.size == 0:
+        return 0
+    
+    # every |left - right| is bounded by the span of all IDs
+    span = max(int(left[-1]), int(right[-1])) - min(int(left[0]), int(right[0]))
+    if span * left.size < INT64_LIMIT:
+        return int(np.abs(left - right).sum())
+    
+    return sum(abs(r - l) for l, r in zip(left.tolist(), right.tolist()))
+
+
+def similarity_score_numpy(left_location_ids, right_location_ids,
+                           is_sorted: bool = False) -> int:
+    """Vectorized part_2. When the IDs span a range not much wider than their
+    number, the right IDs are counted into one np.bincount table indexed by
+    ID, with no sorting or searching. Otherwise they are counted with
+    np.unique, and the left IDs, sorted first since the score does not
+    depend on order, are looked up with np.searchsorted. Falls back to
+    Python ints when the sum could overflow int64.
+
+    Args:
+        left_location_ids (list[int] | array): The left location IDs.
+        right_location_ids (list[int] | array): The right location IDs.
+        is_sorted (bool): Both columns are already sorted int64 arrays.
+
+    Returns:
+        int: The similarity score.
+    """
+    left = to_numpy_column(left_location_ids)
+    right = to_numpy_column(right_location_ids)
+    if left.size == 0 or right.size == 0:
+        return 0
+    
+    smallest_id = min(int(left.min()), int(right.min()))
+    id_span = max(int(left.max()), int(right.max())) - smallest_id
+    if id_span < DENSE_SPAN_FACTOR * (left.size + right.size):
+        right_counts = np.bincount(right - smallest_id, minlength=id_span + 1)
+        counts = right_counts[left - smallest_id]
+    else:
+        if not is_sorted:
+            left = np.sort(left)
+        right_ids, right_counts = np.unique(right, return_counts=True)
+        index = np.searchsorted(right_ids, left).clip(max=right_ids.size - 1)
+        counts = np.where(right_ids[index] == left, right_counts[index], 0)
+    
+    largest_id = max(abs(int(left.min())), abs(int(left.max())))
+    if largest_id * int(counts.sum()) < INT64_LIMIT:
+        return int(np.dot(left, counts))
+    
+    return sum(map(mul, left.tolist(), counts.tolist()))
+
+
+def part_1(text: list[str] | tuple[array, array],
+           use_numpy: bool = False) -> int:
     """Parses 'text' into left and right (sorted) lists,
     and calculates total distance between each list value via zip(left, right).
 
+    Pre-parsed list columns are sorted in place. Compact columns (array('q')
+    or snapshot memoryviews) cannot be, so they go through the NumPy backend
+    when it is installed, which sorts int64 copies instead of boxing every ID
+    into a list.
+
     Args:
-        text (list[str]): The input as a list of its lines.
+        text (list[str] | tuple[array, array]): The input as a list of its
+        lines, or as pre-parsed (left, right) columns.
+        use_numpy (bool): Use the vectorized NumPy backend, if it is installed.
 
     Returns:
         int: The total distance.
     """
     total_distance = 0
-    left_location_ids, right_location_ids = parse_input_to_lists(text)
+    with profiling.span("parse"):
+        left_location_ids, right_location_ids = as_columns(text)
+    is_list = isinstance(left_location_ids, list)
+    if np is not None and (use_numpy or not is_list):
+        with profiling.span("solve"):
+            return total_distance_numpy(left_location_ids, right_location_ids)
     
     # Sort the two lists to match requirement
-    left_location_ids.sort()
-    right_location_ids.sort()
-    for pair in zip(left_location_ids, right_location_ids):
-        total_distance += (abs(pair[1] - pair[0]))
+    with profiling.span("sort"):
+        if is_list:
+            left_location_ids.sort()
+            right_location_ids.sort()
+        else:
+            left_location_ids = sorted(left_location_ids)
+            right_location_ids = sorted(right_location_ids)
+    with profiling.span("solve"):
+        for pair in zip(left_location_ids, right_location_ids):
+            total_distance += (abs(pair[1] - pair[0]))
+        
+    return total_distance
+
+
+def spill_sorted_run(location_ids: list[int], directory: str) -> str:
+    """Sorts 'location_ids' and writes them to a new int64 run file.
+
+    Args:
+        location_ids (list[int]): The IDs of one run; emptied afterwards.
+        directory (str): Where the run file is created.
+
+    Returns:
+        str: Path to the run file.
+    """
+    location_ids.sort()
+    fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(fd, "wb") as f:
+        array("q", location_ids).tofile(f)
+    location_ids.clear()
+    return path
+
+
+def iter_run(path: str, buffer_items: int) -> Iterator[int]:
+    """Yields the IDs of a run file, reading 'buffer_items' IDs at a time.
+
+    Args:
+        path (str): Path to the run file.
+        buffer_items (int): Number of IDs held in memory at once.
+
+    Yields:
+        int: The next ID of the run, in sorted order.
+    """
+    with open(path, "rb") as f:
+        while True:
+            buffer = array("q", f.read(buffer_items * 8))
+            if not buffer:
+                return
+            yield from buffer
+
+
+def part_1_external(path: str, memory_budget: int = MEMORY_BUDGET) -> int:
+    """Same answer as part_1, for inputs larger than memory. Streams the file
+    at 'path' into sorted runs bounded by 'memory_budget', spills them to temp
+    files, then sums the distances during a k-way heapq.merge of both columns.
+
+    Args:
+        path (str): Path to the input file.
+        memory_budget (int): Rough peak memory in bytes for IDs held in
+        memory at once.
+
+    Returns:
+        int: The total distance.
+    """
+    run_items = max(1, memory_budget // (2 * BYTES_PER_ID))
+    left_location_ids = []
+    right_location_ids = []
+    left_runs = []
+    right_runs = []
+    
+    with tempfile.TemporaryDirectory() as directory:
+        for line in loader.iter_lines(path):
+            if not line:
+                continue
+            left_id, right_id = line.split()
+            left_location_ids.append(int(left_id))
+            right_location_ids.append(int(right_id))
+            if len(left_location_ids) == run_items:
+                left_runs.append(spill_sorted_run(left_location_ids,
+                                                  directory))
+                right_runs.append(spill_sorted_run(right_location_ids,
+                                                   directory))
+        
+        # everything fit in one run, no merge needed
+        if not left_runs:
+            return part_1((left_location_ids, right_location_ids))
         
+        if left_location_ids:
+            left_runs.append(spill_sorted_run(left_location_ids, directory))
+            right_runs.append(spill_sorted_run(right_location_ids, directory))
+        
+        # the merge reads every run of both columns at once
+        buffer_items = max(1, memory_budget // (16 * len(left_runs)))
+        left_merged = heapq.merge(*(iter_run(run, buffer_items)
+                                    for run in left_runs))
+        right_merged = heapq.merge(*(iter_run(run, buffer_items)
+                                     for run in right_runs))
+        total_distance = 0
+        for left_id, right_id in zip(left_merged, right_merged):
+            total_distance += abs(right_id - left_id)
+    
     return total_distance
 
 
-def part_2(text: list[str]) -> int:
+def part_2(text: list[str] | tuple[array, array],
+           use_numpy: bool = False) -> int:
     """Parses 'text' into left and right lists,
     and calculates similarity score by adding up each number in the left list
     after multiplying it by the number of times that number appears in the
     right list.
 
     Args:
-        text (list[str]): The input as a list of its lines.
+        text (list[str] | tuple[array, array]): The input as a list of its
+        lines, or as pre-parsed (left, right) columns.
+        use_numpy (bool): Use the vectorized NumPy backend, if it is installed.
 
     Returns:
         int: The similarity score.
     """
     similarity_score = 0
-    left_location_ids, right_location_ids = parse_input_to_lists(text)
-        
-    right_id_counter = Counter(right_location_ids)
-    for id in left_location_ids:
-        similarity_score += id * right_id_counter[id]
+    with profiling.span("parse"):
+        left_location_ids, right_location_ids = as_columns(text)
+    if use_numpy and np is not None:
+        with profiling.span("solve"):
+            return similarity_score_numpy(left_location_ids,
+                                          right_location_ids)
     
-    return similarity_score
+    with profiling.span("solve"):
+        right_id_counter = Counter(right_location_ids)
+        for id in left_location_ids:
+            similarity_score += id * right_id_counter[id]
     
+    return similarity_score
+
+
+def solve_both(text: list[str] | tuple[array, array],
+               use_numpy: bool = False) -> tuple[int, int]:
+    """Computes part_1 and part_2 from a single parse of 'text', instead of
+    each part parsing it again. On the NumPy backend, both parts also share
+    the sorted columns.
+
+    Args:
+        text (list[str] | tuple[array, array]): The input as a list of its
+        lines, or as pre-parsed (left, right) columns.
+        use_numpy (bool): Use the vectorized NumPy backend, if it is installed.
+
+    Returns:
+        tuple[int, int]: The total distance and the similarity score.
+    """
+    with profiling.span("parse"):
+        columns = as_columns(text)
+    if np is not None and (use_numpy or not isinstance(columns[0], list)):
+        # both parts share one sort of each column
+        with profiling.span("sort"):
+            left = np.sort(to_numpy_column(columns[0]))
+            right = np.sort(to_numpy_column(columns[1]))
+        with profiling.span("solve"):
+            return (total_distance_numpy(left, right, is_sorted=True),
+                    similarity_score_numpy(left, right, is_sorted=True))
     
+    return (part_1(columns, use_numpy), part_2(columns, use_numpy))
+
+
+class _DistanceBlock:
+    """A run of consecutive entries of Day01Index's distinct IDs. Entry i has
+    an ID, its D (see Day01Index) stored as d[i] + lazy, and the width up to
+    the next ID. A histogram of widths per stored d lets a whole-block
+    D += 1 or D -= 1 update the block's cost in O(1).
+    """
+
+    def __init__(self, ids: list[int], d: list[int], widths: list[int]) -> None:
+        self.ids = ids
+        self.d = d
+        self.widths = widths
+        self.lazy = 0
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Folds 'lazy' into 'd' and recomputes the block's sums."""
+        if self.lazy:
+            self.d = [d + self.lazy for d in self.d]
+        self.lazy = 0
+        self.histogram: dict[int, int] = {}
+        self.width = 0
+        self.nonnegative_width = 0
+        self.cost = 0
+        for d, width in zip(self.d, self.widths):
+            self._account(d, width, 1)
+
+    def _account(self, d: int, width: int, sign: int) -> int:
+        """Adds (sign=1) or takes out (sign=-1) one entry's share of the
+        block's sums, and returns the change of the block's cost."""
+        self.histogram[d] = self.histogram.get(d, 0) + sign * width
+        self.width += sign * width
+        if d + self.lazy >= 0:
+            self.nonnegative_width += sign * width
+        cost = sign * abs(d + self.lazy) * width
+        self.cost += cost
+        return cost
+
+    def shift(self, delta: int) -> int:
+        """Adds 'delta' (1 or -1) to the D of every entry, and returns the
+        change of the block's cost."""
+        if delta > 0:
+            # |D + 1| - |D| is 1 where D >= 0, and -1 elsewhere
+            cost = 2 * self.nonnegative_width - self.width
+            self.nonnegative_width += self.histogram.get(-self.lazy - 1, 0)
+        else:
+            # |D - 1| - |D| is -1 where D >= 1, and 1 elsewhere
+            zero_width = self.histogram.get(-self.lazy, 0)
+            cost = self.width - 2 * (self.nonnegative_width - zero_width)
+            self.nonnegative_width -= zero_width
+        self.lazy += delta
+        self.cost += cost
+        return cost
+
+    def add_range(self, start: int, stop: int, delta: int) -> int:
+        """Adds 'delta' to the D of entries [start, stop), and returns the
+        change of the block's cost. A range over most of the block is done
+        as a shift of the whole block minus its complement."""
+        if 2 * (stop - start) > len(self.ids):
+            return (self.shift(delta) +
+                    self._add_entries(0, start, -delta) +
+                    self._add_entries(stop, len(self.ids), -delta))
+        return self._add_entries(start, stop, delta)
+
+    def _add_entries(self, start: int, stop: int, delta: int) -> int:
+        """Adds 'delta' to the stored d of entries [start, stop) one by one,
+        and returns the change of the block's cost."""
+        d, widths, histogram = self.d, self.widths, self.histogram
+        lazy = self.lazy
+        cost = 0
+        nonnegative_width = 0
+        for i in range(start, stop):
+            old, width = d[i], widths[i]
+            new = d[i] = old + delta
+            histogram[old] -= width
+            histogram[new] = histogram.get(new, 0) + width
+            cost += (abs(new + lazy) - abs(old + lazy)) * width
+            nonnegative_width += ((new + lazy >= 0) - (old + lazy >= 0)) * width
+        self.nonnegative_width += nonnegative_width
+        self.cost += cost
+        return cost
+
+    def set_width(self, i: int, width: int) -> int:
+        """Sets the width of entry i, and returns the change of the block's
+        cost."""
+        cost = self._account(self.d[i], self.widths[i], -1)
+        self.widths[i] = width
+        return cost + self._account(self.d[i], width, 1)
+
+    def insert(self, i: int, location_id: int, d: int, width: int) -> int:
+        """Inserts an entry at i with a D of 'd', and returns the change of
+        the block's cost."""
+        self.ids.insert(i, location_id)
+        self.d.insert(i, d - self.lazy)
+        self.widths.insert(i, width)
+        return self._account(d - self.lazy, width, 1)
+
+
+class Day01Index:
+    """Keeps the part_1 and part_2 answers up to date while location ID pairs
+    are added and removed, so nothing is re-parsed or re-sorted per refresh.
+
+    The similarity score is the sum of id * left_count[id] * right_count[id],
+    so each update changes it by one Counter lookup.
+
+    Pairing up both sorted columns, the total distance equals the sum over
+    every gap between consecutive distinct IDs x < y of |D(x)| * (y - x),
+    where D(x) counts the left IDs <= x minus the right IDs <= x. Adding the
+    pair (a, b) adds 1 to D on [a, b) (or -1 on [b, a)), so each update is a
+    range update of D. The distinct IDs are kept in sorted blocks of about
+    BLOCK_SIZE entries, each with the cost it adds up to, so an update costs
+    O(BLOCK_SIZE + distinct IDs / BLOCK_SIZE).
+
+    The entry of an ID that is removed from both lists stays in its block
+    (it does not change D), until more than DEAD_FRACTION of the entries are
+    such dead ones and the index is rebuilt from the IDs still present.
+    """
+
+    BLOCK_SIZE = 256
+
+    # Share of dead entries that triggers a rebuild
+    DEAD_FRACTION = 0.5
+
+    # Pairs indexed per pair of a batch that is still cheaper to add one
+    # pair at a time than to rebuild from
+    REBUILD_RATIO = 64
+
+    def __init__(self, pairs=()) -> None:
+        self.left_counter = Counter()
+        self.right_counter = Counter()
+        self._size = 0
+        for left_id, right_id in pairs:
+            self.left_counter[left_id] += 1
+            self.right_counter[right_id] += 1
+            self._size += 1
+        self._build()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _build(self) -> None:
+        """Rebuilds everything from the counters, with one sort of the
+        distinct IDs and one pass over them."""
+        self.similarity_score = sum(
+            location_id * count * self.right_counter[location_id]
+            for location_id, count in self.left_counter.items()
+        )
+        
+        ids = sorted(self.left_counter.keys() | self.right_counter.keys())
+        self._entries = len(ids)
+        self._dead_entries = 0
+        d = []
+        running = 0
+        for location_id in ids:
+            running += (self.left_counter[location_id] -
+                        self.right_counter[location_id])
+            d.append(running)
+        widths = [y - x for x, y in zip(ids, ids[1:])] + [0] * bool(ids)
+        
+        self._blocks = [
+            _DistanceBlock(ids[i:i + self.BLOCK_SIZE],
+                           d[i:i + self.BLOCK_SIZE],
+                           widths[i:i + self.BLOCK_SIZE])
+            for i in range(0, len(ids), self.BLOCK_SIZE)
+        ]
+        self._firsts = [block.ids[0] for block in self._blocks]
+        self.total_distance = sum(block.cost for block in self._blocks)
+
+    def _locate(self, location_id: int) -> tuple[int, int]:
+        """Returns the block and the position in it where 'location_id' is,
+        or would be inserted."""
+        b = max(0, bisect_right(self._firsts, location_id) - 1)
+        return (b, bisect_left(self._blocks[b].ids, location_id))
+
+    def _insert_id(self, location_id: int) -> None:
+        """Adds an entry for 'location_id' if it has none yet. It takes the D
+        of the entry before it, and splits that entry's width. Call it before
+        counting the ID in."""
+        if not self._blocks:
+            self._blocks = [_DistanceBlock([location_id], [0], [0])]
+            self._firsts = [location_id]
+            self._entries = 1
+            return
+        
+        b, i = self._locate(location_id)
+        block = self._blocks[b]
+        if i < len(block.ids) and block.ids[i] == location_id:
+            if (location_id not in self.left_counter and
+                location_id not in self.right_counter):
+                self._dead_entries -= 1
+            return
+        
+        self._entries += 1
+        if i < len(block.ids):
+            width = block.ids[i] - location_id
+        elif b + 1 < len(self._blocks):
+            width = self._firsts[b + 1] - location_id
+        else:
+            width = 0
+        if i:
+            d = block.d[i - 1] + block.lazy
+            self.total_distance += block.set_width(
+                i - 1, location_id - block.ids[i - 1]
+            )
+        else:
+            # only the smallest ID of all lands in front of a block
+            d = 0
+            self._firsts[b] = location_id
+        self.total_distance += block.insert(i, location_id, d, width)
+        
+        if len(block.ids) > 2 * self.BLOCK_SIZE:
+            block.rebuild()
+            half = len(block.ids) // 2
+            tail = _DistanceBlock(block.ids[half:], block.d[half:],
+                                  block.widths[half:])
+            del block.ids[half:], block.d[half:], block.widths[half:]
+            block.rebuild()
+            self._blocks.insert(b + 1, tail)
+            self._firsts.insert(b + 1, tail.ids[0])
+
+    def _add_to_d(self, start_id: int, stop_id: int, delta: int) -> None:
+        """Adds 'delta' to D on [start_id, stop_id); both have entries."""
+        start_block, start = self._locate(start_id)
+        stop_block, stop = self._locate(stop_id)
+        blocks = self._blocks
+        if start_block == stop_block:
+            self.total_distance += blocks[start_block].add_range(start, stop,
+                                                                 delta)
+            return
+        
+        first = blocks[start_block]
+        self.total_distance += first.add_range(start, len(first.ids), delta)
+        for block in blocks[start_block + 1:stop_block]:
+            self.total_distance += block.shift(delta)
+        self.total_distance += blocks[stop_block].add_range(0, stop, delta)
+
+    def _add_pair(self, left_id: int, right_id: int, delta: int) -> None:
+        """Moves D for adding (delta=1) or removing (delta=-1) one pair."""
+        if left_id < right_id:
+            self._add_to_d(left_id, right_id, delta)
+        elif right_id < left_id:
+            self._add_to_d(right_id, left_id, -delta)
+
+    def add(self, left_id: int, right_id: int) -> None:
+        """Adds one location ID pair.
+
+        Args:
+            left_id (int): The location ID of the left list.
+            right_id (int): The location ID of the right list.
+        """
+        self._insert_id(left_id)
+        self.similarity_score += left_id * self.right_counter[left_id]
+        self.left_counter[left_id] += 1
+        self._insert_id(right_id)
+        self.similarity_score += right_id * self.left_counter[right_id]
+        self.right_counter[right_id] += 1
+        self._size += 1
+        
+        self._add_pair(left_id, right_id, 1)
+
+    def remove(self, left_id: int, right_id: int) -> None:
+        """Removes one location ID pair. The two IDs do not need to have been
+        added together, only to be present in their lists.
+
+        Args:
+            left_id (int): The location ID of the left list.
+            right_id (int): The location ID of the right list.
+
+        Raises:
+            ValueError: If either ID is not in its list.
+        """
+        if not self.left_counter[left_id] or not self.right_counter[right_id]:
+            raise ValueError(f"pair ({left_id}, {right_id}) is not indexed")
+        
+        self.right_counter[right_id] -= 1
+        self.similarity_score -= right_id * self.left_counter[right_id]
+        self.left_counter[left_id] -= 1
+        self.similarity_score -= left_id * self.right_counter[left_id]
+        self._size -= 1
+        
+        self._add_pair(left_id, right_id, -1)
+        for counter, location_id in ((self.right_counter, right_id),
+                                     (self.left_counter, left_id)):
+            if not counter[location_id]:
+                del counter[location_id]
+                if (location_id not in self.left_counter and
+                    location_id not in self.right_counter):
+                    self._dead_entries += 1
+        if self._dead_entries > self.DEAD_FRACTION * self._entries:
+            self._build()
+
+    def update(self, pairs) -> None:
+        """Adds every (left_id, right_id) pair of 'pairs'. Adding a pair costs
+        roughly as much as rebuilding 1/REBUILD_RATIO of the index, so a
+        larger batch is counted in and the index rebuilt instead.
+
+        Args:
+            pairs (Iterable[tuple[int, int]]): The location ID pairs.
+        """
+        pairs = list(pairs)
+        if len(pairs) * self.REBUILD_RATIO <= self._size:
+            for left_id, right_id in pairs:
+                self.add(left_id, right_id)
+            return
+        
+        for left_id, right_id in pairs:
+            self.left_counter[left_id] += 1
+            self.right_counter[right_id] += 1
+        self._size += len(pairs)
+        self._build()
+
+    def answers(self) -> tuple[int, int]:
+        """Returns the current (part_1, part_2) answers."""
+        return (self.total_distance, self.similarity_score)
+
 
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("-t", "--test", action="store_true", help="Enable command line input for testing")
+    parser.add_argument("-e", "--external", action="store_true", help="Compute part 1 of the input file with an out-of-core merge sort")
+    parser.add_argument("-m", "--memory-budget", type=int, default=MEMORY_BUDGET, help="Peak memory in bytes for --external")
+    parser.add_argument("-n", "--numpy", action="store_true", help="Use the vectorized NumPy backend (falls back to pure Python if NumPy is missing)")
+    parser.add_argument("-s", "--snapshot", action="store_true", help="Load the parsed input file from its binary snapshot, saving one if needed")
     args = parser.parse_args()
     
     # Part 1 and 2 w/test input
@@ -72,18 +711,29 @@ def main() -> None:
         while line:
             test_lines.append(line)
             line = input()
-        print(f"Answer for part 1 test: {part_1(test_lines)}")
-        print(f"Answer for part 2 test: {part_2(test_lines)}\n")
+        total_distance, similarity_score = solve_both(test_lines, args.numpy)
+        print(f"Answer for part 1 test: {total_distance}")
+        print(f"Answer for part 2 test: {similarity_score}\n")
         
         
-    # Part 1 w/input file
-    file_lines = []
+    # Part 1 w/input file, larger than memory
+    if args.external:
+        try:
+            total_distance = part_1_external("input.txt", args.memory_budget)
+            print(f"Answer for part 1 file input: {total_distance}\n")
+        except FileNotFoundError:
+            print("'input.txt' does not exist in parent directory.")
+        return
+    
+    # Part 1 and 2 w/input file, parsed once into columns
     try:
-        with open("input.txt", "r") as f:
-            for line in f:
-                file_lines.append(line.rstrip())
-        print(f"Answer for part 1 file input: {part_1(file_lines)}")
-        print(f"Answer for part 2 file input: {part_2(file_lines)}\n")
+        if args.snapshot:
+            columns = load_columns("input.txt")
+        else:
+            columns = parse_file_to_columns("input.txt")
+        total_distance, similarity_score = solve_both(columns, args.numpy)
+        print(f"Answer for part 1 file input: {total_distance}")
+        print(f"Answer for part 2 file input: {similarity_score}\n")
     except FileNotFoundError:
         print("'input.txt' does not exist in parent directory.")
         return
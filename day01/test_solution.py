@@ -0,0 +1,90 @@
+# aoc2024/day01/test_solution.py
+# Checks Day01Index against solve_both after random adds and removes
+
+import random
+
+from solution import Day01Index, solve_both
+
+
+def check(index: Day01Index, pairs: list[tuple[int, int]]) -> None:
+    """Asserts that 'index' answers like solve_both on 'pairs'."""
+    columns = ([left_id for left_id, _ in pairs],
+               [right_id for _, right_id in pairs])
+    assert index.answers() == solve_both(columns)
+    assert len(index) == len(pairs)
+
+
+def test_empty() -> None:
+    check(Day01Index(), [])
+
+
+def test_bulk_build() -> None:
+    rng = random.Random(0)
+    pairs = [(rng.randint(1, 1000), rng.randint(1, 1000))
+             for _ in range(5000)]
+    check(Day01Index(pairs), pairs)
+
+
+def test_random_adds_and_removes() -> None:
+    rng = random.Random(1)
+    for id_range in (5, 100, 10**6):
+        # small blocks, so splits and whole-block shifts both happen
+        index = Day01Index()
+        index.BLOCK_SIZE = 4
+        pairs = []
+        for _ in range(2000):
+            if pairs and rng.random() < 0.4:
+                # a left and a right ID that were not necessarily added
+                # together
+                i, j = rng.randrange(len(pairs)), rng.randrange(len(pairs))
+                left_id, right_id = pairs[i][0], pairs[j][1]
+                pairs[i] = (pairs[j][0], pairs[i][1])
+                del pairs[j]
+                index.remove(left_id, right_id)
+            else:
+                pair = (rng.randint(1, id_range), rng.randint(1, id_range))
+                pairs.append(pair)
+                index.add(*pair)
+            check(index, pairs)
+
+
+def test_update_batches() -> None:
+    rng = random.Random(2)
+    index = Day01Index()
+    # batches are added one pair at a time or rebuilt from, alternately
+    index.REBUILD_RATIO = 2
+    pairs = []
+    for size in (10, 1, 50, 20, 500):
+        batch = [(rng.randint(1, 300), rng.randint(1, 300))
+                 for _ in range(size)]
+        index.update(batch)
+        pairs.extend(batch)
+        check(index, pairs)
+
+
+def test_remove_missing() -> None:
+    index = Day01Index([(1, 2)])
+    try:
+        index.remove(2, 2)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("removed a pair that is not indexed")
+
+
+def test_removed_ids_are_dropped() -> None:
+    rng = random.Random(3)
+    index = Day01Index()
+    index.BLOCK_SIZE = 4
+    pairs = []
+    for generation in range(20):
+        # every generation uses new IDs, then removes all of them
+        batch = [(rng.randint(1, 50) + 100 * generation,
+                  rng.randint(1, 50) + 100 * generation) for _ in range(30)]
+        for pair in batch:
+            index.add(*pair)
+        for pair in batch:
+            index.remove(*pair)
+        check(index, pairs)
+        assert not index.left_counter and not index.right_counter
+        assert sum(len(block.ids) for block in index._blocks) <= 2 * 60
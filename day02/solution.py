@@ -2,87 +2,570 @@
 # Solution to Advent of Code 2024 Day 2: Red-Nosed Reports
 
 import argparse
-from copy import deepcopy
+import os
+import sys
+from array import array
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from itertools import pairwise
+from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Lets the solution run as a script from its own directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc2024 import loader, profiling, snapshot
+
+
+# Bytes read at a time by each score_chunk worker
+CHUNK_SIZE = 1 << 22
+
+# Array typecodes a ReportStore widens its deltas through, smallest first
+DELTA_TYPECODES = "bhq"
 
-def part_1(text: list[str]) -> int:
-    """Goes through each report in text,
-    and checks the levels for increases and decreases by at least 1/at most 3.
+
+def parse_reports_to_buffers(text: list[str]) -> tuple:
+    """Parses every report into one ragged layout: a flat buffer of all
+    levels, plus offsets where report r is levels[offsets[r]:offsets[r + 1]].
 
     Args:
         text (list[str]): The input as a list of its lines.
 
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The int64 levels and offsets.
+    """
+    tokens = []
+    lengths = np.empty(len(text), dtype=np.int64)
+    for i, report in enumerate(text):
+        report_levels = report.split()
+        lengths[i] = len(report_levels)
+        tokens.extend(report_levels)
+    
+    levels = np.array(tokens, dtype=np.int64)
+    offsets = np.zeros(len(text) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return (levels, offsets)
+
+
+def bad_step_counts(levels: "np.ndarray", offsets: "np.ndarray") -> tuple:
+    """Marks every adjacent pair of levels that is not an increase (or not a
+    decrease) of 1 to 3, and prefix-sums the marks, so the number of bad
+    steps between levels a and b of the flat buffer is counts[b] - counts[a].
+    Pairs spanning two reports are never marked.
+
+    Args:
+        levels (np.ndarray): The flat levels from parse_reports_to_buffers.
+        offsets (np.ndarray): The report offsets into 'levels'.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The increasing and decreasing counts.
+    """
+    steps = np.diff(levels)
+    same_report = np.ones(steps.size, dtype=bool)
+    boundaries = offsets[1:-1] - 1
+    boundaries = boundaries[(boundaries >= 0) & (boundaries < steps.size)]
+    same_report[boundaries] = False
+    
+    counts = []
+    for direction in (1, -1):
+        directed = steps * direction
+        bad = ~((directed >= 1) & (directed <= 3)) & same_report
+        bad_counts = np.zeros(levels.size + 1, dtype=np.int64)
+        np.cumsum(bad, out=bad_counts[1:steps.size + 1])
+        bad_counts[steps.size + 1:] = bad_counts[steps.size]
+        counts.append(bad_counts)
+    
+    return tuple(counts)
+
+
+def batch_part_1(levels: "np.ndarray", offsets: "np.ndarray",
+                 counts: tuple | None = None) -> int:
+    """Vectorized part_1 over the ragged layout: a report is safe if it has
+    no bad steps in one of the two directions.
+
+    Args:
+        levels (np.ndarray): The flat levels from parse_reports_to_buffers.
+        offsets (np.ndarray): The report offsets into 'levels'.
+        counts (tuple | None): The bad_step_counts of the levels, if they
+        were already computed.
+
     Returns:
         int: The number of safe reports.
     """
-    safe_reports = 0
-    for report in text:
-        is_safe = True
-        report_as_list = [int(level) for level in report.split()]
-        
-        # All up/down check
-        if (report_as_list != sorted(report_as_list) and
-            report_as_list != sorted(report_as_list, reverse=True)):
-            continue
-
-        # Amount change check
-        for i, level in enumerate(report_as_list[:-1]):
-            difference = report_as_list[i + 1] - level
-            if abs(difference) > 3 or difference == 0:
-                is_safe = False
-                break
-            
-        if is_safe:
-            safe_reports += 1
+    counts = counts or bad_step_counts(levels, offsets)
+    starts = offsets[:-1]
+    last_steps = np.maximum(offsets[1:] - 1, starts)
+    is_safe = np.zeros(starts.size, dtype=bool)
+    for bad_counts in counts:
+        is_safe |= bad_counts[last_steps] == bad_counts[starts]
+    
+    return int(is_safe.sum())
 
-    return safe_reports
+
+def batch_part_2(levels: "np.ndarray", offsets: "np.ndarray",
+                 counts: tuple | None = None) -> int:
+    """Vectorized part_2 over the ragged layout. Every level is tried as the
+    removed one at once: removing level j is safe if the steps before j - 1
+    and after j + 1 are all good and the step bridging j - 1 to j + 1 is good.
+    A segmented any() then marks the reports with a safe removal.
+
+    Args:
+        levels (np.ndarray): The flat levels from parse_reports_to_buffers.
+        offsets (np.ndarray): The report offsets into 'levels'.
+        counts (tuple | None): The bad_step_counts of the levels, if they
+        were already computed.
+
+    Returns:
+        int: The number of safe reports.
+    """
+    lengths = np.diff(offsets)
+    empty_reports = int((lengths == 0).sum())
+    if levels.size == 0:
+        return empty_reports
+    
+    starts = np.repeat(offsets[:-1], lengths)
+    stops = np.repeat(offsets[1:], lengths)
+    removed = np.arange(levels.size)
+    has_bridge = (removed > starts) & (removed < stops - 1)
+    before = levels[np.maximum(removed - 1, 0)]
+    after = levels[np.minimum(removed + 1, levels.size - 1)]
+    
+    is_safe = np.zeros(levels.size, dtype=bool)
+    counts = counts or bad_step_counts(levels, offsets)
+    for direction, bad_counts in zip((1, -1), counts):
+        bridge = (after - before) * direction
+        is_safe |= ((bad_counts[np.maximum(removed - 1, starts)] ==
+                     bad_counts[starts]) &
+                    (bad_counts[np.maximum(stops - 1, removed + 1)] ==
+                     bad_counts[removed + 1]) &
+                    (~has_bridge | ((bridge >= 1) & (bridge <= 3))))
+    
+    # empty reports are trivially safe and have no segment to reduce
+    segments = offsets[:-1][lengths > 0]
+    return int(np.logical_or.reduceat(is_safe, segments).sum()) + empty_reports
 
 
-def part_2(text: list[str]) -> int:
+def part_1(text: list[str], use_numpy: bool = False) -> int:
     """Goes through each report in text,
     and checks the levels for increases and decreases by at least 1/at most 3.
-    However, it allows for one bad level.
 
     Args:
         text (list[str]): The input as a list of its lines.
+        use_numpy (bool): Classify every report in one vectorized pass, if
+        NumPy is installed.
 
     Returns:
         int: The number of safe reports.
     """
+    if use_numpy and np is not None:
+        with profiling.span("parse"):
+            buffers = parse_reports_to_buffers(text)
+        with profiling.span("solve"):
+            return batch_part_1(*buffers)
+    
+    # reports are parsed and checked one at a time, so parsing is timed as
+    # part of "solve"
     safe_reports = 0
-    for report in text:
-        report_as_list = [int(level) for level in report.split()]
-        
-        # Brute force every iteration of report
-        for i in range(len(report_as_list)):
-            sub_list = deepcopy(report_as_list)
-            sub_list.pop(i)
+    with profiling.span("solve"):
+        for report in text:
             is_safe = True
-            unsafe_count = 0
+            report_as_list = [int(level) for level in report.split()]
             
-            if (sub_list != sorted(sub_list) and
-                sub_list != sorted(sub_list, reverse=True)):
+            # All up/down check
+            if (report_as_list != sorted(report_as_list) and
+                report_as_list != sorted(report_as_list, reverse=True)):
                 continue
 
-            for i, level in enumerate(sub_list[:-1]):
-                difference = sub_list[i + 1] - level
+            # Amount change check
+            for i, level in enumerate(report_as_list[:-1]):
+                difference = report_as_list[i + 1] - level
                 if abs(difference) > 3 or difference == 0:
                     is_safe = False
-                    unsafe_count += 1
                     break
                 
-            # only need one safe iteration for a report to be fully safe
-            if is_safe and unsafe_count == 0:
+            if is_safe:
+                safe_reports += 1
+
+    return safe_reports
+
+
+def count_removals(levels: list[int], direction: int,
+                   tolerance: int) -> int:
+    """Finds the fewest levels that must be removed for 'levels' to only
+    increase (direction=1) or only decrease (direction=-1) by 1 to 3.
+
+    Works in one pass: best[j] is the fewest removals that leave a safe run
+    ending at level j, and a run can only skip 'tolerance' levels at most, so
+    j only looks back at the previous tolerance + 1 levels. That makes it
+    O(n * (tolerance + 1)) with no copies of the report.
+
+    Args:
+        levels (list[int]): The levels of a report.
+        direction (int): 1 for increasing, -1 for decreasing.
+        tolerance (int): The number of bad levels that may be removed.
+
+    Returns:
+        int: The fewest removals, or more than 'tolerance' if it is unsafe.
+    """
+    n = len(levels)
+    best = [0] * n
+    fewest = n
+    for j in range(n):
+        # remove every level before j
+        removals = j
+        for i in range(max(0, j - tolerance - 1), j):
+            step = (levels[j] - levels[i]) * direction
+            if 1 <= step <= 3 and best[i] + j - i - 1 < removals:
+                removals = best[i] + j - i - 1
+        best[j] = removals
+        
+        # remove every level after j
+        fewest = min(fewest, removals + n - 1 - j)
+    
+    return fewest
+
+
+def is_safe(levels: list[int], tolerance: int = 0) -> bool:
+    """Checks if 'levels' is safe after removing at most 'tolerance' bad
+    levels.
+
+    Args:
+        levels (list[int]): The levels of a report.
+        tolerance (int): The number of bad levels that may be removed.
+
+    Returns:
+        bool: True if the report is safe.
+    """
+    return (count_removals(levels, 1, tolerance) <= tolerance or
+            count_removals(levels, -1, tolerance) <= tolerance)
+
+
+def part_2(text: list[str], tolerance: int = 1,
+           use_numpy: bool = False) -> int:
+    """Goes through each report in text,
+    and checks the levels for increases and decreases by at least 1/at most 3.
+    However, it allows for one bad level (or 'tolerance' bad levels).
+
+    Args:
+        text (list[str]): The input as a list of its lines.
+        tolerance (int): The number of bad levels allowed per report.
+        use_numpy (bool): Classify every report in one vectorized pass, if
+        NumPy is installed. Only supports a tolerance of 1.
+
+    Returns:
+        int: The number of safe reports.
+    """
+    if use_numpy and np is not None and tolerance == 1:
+        with profiling.span("parse"):
+            buffers = parse_reports_to_buffers(text)
+        with profiling.span("solve"):
+            return batch_part_2(*buffers)
+    
+    safe_reports = 0
+    with profiling.span("solve"):
+        for report in text:
+            report_as_list = [int(level) for level in report.split()]
+            if is_safe(report_as_list, tolerance):
                 safe_reports += 1
-                break
         
     return safe_reports
     
 
+def solve_both(text: list[str], tolerance: int = 1,
+               use_numpy: bool = False) -> tuple[int, int]:
+    """Computes part_1 and part_2 in one pass over the reports, each parsed
+    once; see count_safe_reports.
+
+    Args:
+        text (list[str]): The input as a list of its lines.
+        tolerance (int): The number of bad levels allowed per report in
+        part_2.
+        use_numpy (bool): Classify every report in one vectorized pass, if
+        NumPy is installed. Only supports a tolerance of 1.
+
+    Returns:
+        tuple[int, int]: The number of safe reports of each part.
+    """
+    if use_numpy and np is not None and tolerance == 1:
+        with profiling.span("parse"):
+            levels, offsets = parse_reports_to_buffers(text)
+        with profiling.span("solve"):
+            counts = bad_step_counts(levels, offsets)
+            return (batch_part_1(levels, offsets, counts),
+                    batch_part_2(levels, offsets, counts))
+    
+    with profiling.span("solve"):
+        return count_safe_reports(text, tolerance)
+
+
+def count_safe_reports(reports: Iterable[str | bytes],
+                       tolerance: int = 1) -> tuple[int, int]:
+    """Counts the safe reports for both parts in one pass, parsing each report
+    once. A report that passes part_1's linear check is safe for both parts,
+    so only the others go through is_safe's removal search.
+
+    Args:
+        reports (Iterable[str | bytes]): The reports, one per line.
+        tolerance (int): The number of bad levels allowed per report in
+        part_2.
+
+    Returns:
+        tuple[int, int]: The number of safe reports of each part.
+    """
+    safe_reports = 0
+    tolerated_reports = 0
+    for report in reports:
+        report_as_list = [int(level) for level in report.split()]
+        # part_1's check: all up/down, then amount change
+        if ((report_as_list == sorted(report_as_list) or
+             report_as_list == sorted(report_as_list, reverse=True)) and
+            all(1 <= abs(second - first) <= 3 for first, second in
+                pairwise(report_as_list))):
+            safe_reports += 1
+            tolerated_reports += 1
+        elif is_safe(report_as_list, tolerance):
+            tolerated_reports += 1
+    
+    return (safe_reports, tolerated_reports)
+    
+
+class ReportStore:
+    """Compact storage for many reports. Safety only depends on the steps
+    between levels, so each report is packed as its deltas into one shared
+    array('b'), widened to 'h' or 'q' only if a delta does not fit, with an
+    offsets index where report r is deltas[offsets[r]:offsets[r + 1]].
+
+    The checks run on memoryview slices of the deltas, so no list is made per
+    report. Removing a level merges its two deltas into their sum.
+    """
+
+    def __init__(self) -> None:
+        self.deltas = array(DELTA_TYPECODES[0])
+        self.offsets = array("q", [0])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "ReportStore":
+        """Packs every report of 'lines', which may be read lazily.
+
+        Args:
+            lines (Iterable[str]): The reports, one per line.
+
+        Returns:
+            ReportStore: The packed reports.
+        """
+        store = cls()
+        for line in lines:
+            store.append(line)
+        return store
+
+    @classmethod
+    def from_buffers(cls, deltas, offsets) -> "ReportStore":
+        """Wraps already packed buffers, e.g. memoryviews from a snapshot.
+        The store is then read-only.
+
+        Args:
+            deltas (array | memoryview): The packed deltas.
+            offsets (array | memoryview): The offsets index.
+
+        Returns:
+            ReportStore: The packed reports.
+        """
+        store = cls()
+        store.deltas = deltas
+        store.offsets = offsets
+        return store
+
+    @classmethod
+    def load(cls, path: str) -> "ReportStore":
+        """Packs the file at 'path', or memory-maps its binary snapshot when
+        one is up to date instead of re-parsing the levels.
+
+        Args:
+            path (str): Path to the input file.
+
+        Returns:
+            ReportStore: The packed reports.
+        """
+        def build() -> list[array]:
+            store = cls.from_lines(loader.iter_lines(path))
+            return [store.deltas, store.offsets]
+
+        return cls.from_buffers(*snapshot.load_or_build(path, "day02", build))
+
+    def append(self, report: str) -> None:
+        """Packs one report.
+
+        Args:
+            report (str): The report's levels, separated by whitespace.
+        """
+        previous = None
+        for level in map(int, report.split()):
+            if previous is not None:
+                self._append_delta(level - previous)
+            previous = level
+        self.offsets.append(len(self.deltas))
+
+    def _append_delta(self, delta: int) -> None:
+        while True:
+            try:
+                self.deltas.append(delta)
+                return
+            except OverflowError:
+                wider = DELTA_TYPECODES.index(self.deltas.typecode) + 1
+                self.deltas = array(DELTA_TYPECODES[wider], self.deltas)
+
+    def count_safe(self, tolerance: int = 0) -> int:
+        """Counts the reports that are safe after removing at most
+        'tolerance' bad levels.
+
+        Args:
+            tolerance (int): The number of bad levels allowed per report.
+
+        Returns:
+            int: The number of safe reports.
+        """
+        deltas = memoryview(self.deltas)
+        # best removals of the last tolerance + 1 levels, reused by all reports
+        window = [0] * (tolerance + 2)
+        safe_reports = 0
+        for start, stop in zip(self.offsets, self.offsets[1:]):
+            report = deltas[start:stop]
+            if not report:
+                safe_reports += 1
+            elif not tolerance:
+                lowest, highest = min(report), max(report)
+                safe_reports += (1 <= lowest and highest <= 3 or
+                                 -3 <= lowest and highest <= -1)
+            else:
+                safe_reports += any(
+                    count_removals_deltas(report, direction, tolerance,
+                                          window) <= tolerance
+                    for direction in (1, -1)
+                )
+        
+        return safe_reports
+
+
+def count_removals_deltas(deltas: memoryview, direction: int,
+                          tolerance: int, window: list[int]) -> int:
+    """Same as count_removals, on a report packed as its deltas. The step
+    from level i to level j is the sum of deltas[i:j], built up while looking
+    back, and best[] only lives in 'window', a ring of tolerance + 2 slots.
+
+    Args:
+        deltas (memoryview): The deltas of a report.
+        direction (int): 1 for increasing, -1 for decreasing.
+        tolerance (int): The number of bad levels that may be removed.
+        window (list[int]): Scratch space of at least tolerance + 2 slots.
+
+    Returns:
+        int: The fewest removals, or more than 'tolerance' if it is unsafe.
+    """
+    n = len(deltas) + 1
+    size = tolerance + 2
+    fewest = n
+    for j in range(n):
+        # remove every level before j
+        removals = j
+        step = 0
+        for i in range(j - 1, max(-1, j - tolerance - 2), -1):
+            step += deltas[i]
+            skipped = window[i % size] + j - i - 1
+            if 1 <= step * direction <= 3 and skipped < removals:
+                removals = skipped
+        window[j % size] = removals
+        
+        # remove every level after j
+        fewest = min(fewest, removals + n - 1 - j)
+    
+    return fewest
+
+
+def find_chunk_boundaries(path: str, chunks: int) -> list[int]:
+    """Splits the file at 'path' into about 'chunks' byte ranges of equal size,
+    moving every boundary forward to the start of the next line.
+
+    Args:
+        path (str): Path to the input file.
+        chunks (int): The number of byte ranges wanted.
+
+    Returns:
+        list[int]: Sorted offsets; chunk i is [boundaries[i], boundaries[i + 1]).
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, "rb") as f:
+        for i in range(1, chunks):
+            f.seek(size * i // chunks)
+            f.readline()
+            if boundaries[-1] < f.tell() < size:
+                boundaries.append(f.tell())
+    boundaries.append(size)
+    return boundaries
+
+
+def score_chunk(path: str, start: int, stop: int,
+                tolerance: int = 1) -> tuple[int, int]:
+    """Counts the safe reports in bytes [start, stop) of the file at 'path'.
+    The range must begin and end on line boundaries. Runs in a worker process,
+    so only the path and offsets are sent to it.
+
+    Args:
+        path (str): Path to the input file.
+        start (int): Offset of the first byte of the chunk.
+        stop (int): Offset just past the last byte of the chunk.
+        tolerance (int): The number of bad levels allowed for part 2.
+
+    Returns:
+        tuple[int, int]: The number of safe reports for part 1 and part 2.
+    """
+    safe_reports = [0, 0]
+    with loader.map_bytes(path) as memory:
+        for block in loader.iter_blocks(memory, start, stop, CHUNK_SIZE):
+            block_safe = count_safe_reports(block.splitlines(), tolerance)
+            safe_reports[0] += block_safe[0]
+            safe_reports[1] += block_safe[1]
+    
+    return tuple(safe_reports)
+
+
+def count_safe_parallel(path: str, workers: int,
+                        tolerance: int = 1) -> tuple[int, int]:
+    """Scores the file at 'path' on 'workers' processes, one line-aligned byte
+    range each, and sums their safe report counts.
+
+    Args:
+        path (str): Path to the input file.
+        workers (int): The number of worker processes.
+        tolerance (int): The number of bad levels allowed for part 2.
+
+    Returns:
+        tuple[int, int]: The number of safe reports for part 1 and part 2.
+    """
+    boundaries = find_chunk_boundaries(path, workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(score_chunk, path, start, stop, tolerance)
+                   for start, stop in zip(boundaries, boundaries[1:])]
+        counts = [future.result() for future in futures]
+    
+    return (sum(count[0] for count in counts),
+            sum(count[1] for count in counts))
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("-t", "--test", action="store_true", help="Enable command line input for testing")
     parser.add_argument("-f", "--file", action="store_true", help="Enable command line input for testing")
+    parser.add_argument("-n", "--numpy", action="store_true", help="Use the vectorized NumPy batch engine (falls back to pure Python if NumPy is missing)")
+    parser.add_argument("-c", "--compact", action="store_true", help="Pack the input file into a compact ReportStore instead of holding its lines")
+    parser.add_argument("-s", "--snapshot", action="store_true", help="Like --compact, loading the packed reports from their binary snapshot, saving one if needed")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Score the input file on N worker processes")
     args = parser.parse_args()
     
     # Part 1 and 2 w/test input
@@ -93,19 +576,41 @@ def main() -> None:
         while line:
             test_lines.append(line)
             line = input()
-        print(f"Answer for part 1 test: {part_1(test_lines)}")
-        print(f"Answer for part 2 test: {part_2(test_lines)}\n")
+        safe_reports = solve_both(test_lines, use_numpy=args.numpy)
+        print(f"Answer for part 1 test: {safe_reports[0]}")
+        print(f"Answer for part 2 test: {safe_reports[1]}\n")
         
         
+    # Part 1 and 2 w/input file, split across worker processes
+    if args.file and args.workers > 1:
+        try:
+            safe_reports = count_safe_parallel("input.txt", args.workers)
+            print(f"Answer for part 1 file input: {safe_reports[0]}")
+            print(f"Answer for part 2 file input: {safe_reports[1]}\n")
+        except FileNotFoundError:
+            print("'input.txt' does not exist in parent directory.")
+        return
+    
+    # Part 1 and 2 w/input file, packed as deltas
+    if args.file and (args.compact or args.snapshot):
+        try:
+            if args.snapshot:
+                store = ReportStore.load("input.txt")
+            else:
+                store = ReportStore.from_lines(loader.iter_lines("input.txt"))
+            print(f"Answer for part 1 file input: {store.count_safe()}")
+            print(f"Answer for part 2 file input: {store.count_safe(1)}\n")
+        except FileNotFoundError:
+            print("'input.txt' does not exist in parent directory.")
+        return
+    
     # Part 1 and 2 w/input file
-    file_lines = []
     if args.file:
         try:
-            with open("input.txt", "r") as f:
-                for line in f:
-                    file_lines.append(line.rstrip())
-            print(f"Answer for part 1 file input: {part_1(file_lines)}")
-            print(f"Answer for part 2 file input: {part_2(file_lines)}\n")
+            file_lines = loader.read_lines("input.txt")
+            safe_reports = solve_both(file_lines, use_numpy=args.numpy)
+            print(f"Answer for part 1 file input: {safe_reports[0]}")
+            print(f"Answer for part 2 file input: {safe_reports[1]}\n")
         except FileNotFoundError:
             print("'input.txt' does not exist in parent directory.")
             return
@@ -0,0 +1,51 @@
+# aoc2024/day03/benchmark.py
+# Benchmark of the single-pass day 3 engine against part_1 + part_2
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Lets the benchmark run as a script from its own directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc2024.bench import generate_memory
+from solution import evaluate, part_1, part_2
+
+
+def best_time(function, text: list[str], repeats: int) -> float:
+    """Returns the fastest of 'repeats' runs of function(text), in seconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(text)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-l", "--lines", type=int, default=1000, help="Number of input lines")
+    parser.add_argument("-w", "--width", type=int, default=5000, help="Fragments per input line")
+    parser.add_argument("-r", "--repeats", type=int, default=5, help="Runs per function, the fastest is kept")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Seed for the synthetic input")
+    args = parser.parse_args()
+
+    text = generate_memory(args.lines, args.width, random.Random(args.seed))
+    print(f"Input: {args.lines} lines, {sum(map(len, text))} characters")
+
+    if evaluate(text) != (part_1(text), part_2(text)):
+        print("evaluate() does not match part_1/part_2.")
+        return
+
+    separate = best_time(lambda t: (part_1(t), part_2(t)), text, args.repeats)
+    fused = best_time(evaluate, text, args.repeats)
+    print(f"part_1 + part_2: {separate:.4f}s")
+    print(f"evaluate:        {fused:.4f}s")
+    print(f"Speedup:         {separate / fused:.2f}x")
+
+    return
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,30 @@
 # Solution to Advent of Code 2024 Day 3: Mull It Over
 
 import argparse
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Lets the solution run as a script from its own directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc2024 import loader, profiling
+
+
+# mul(X,Y) with X and Y captured, and do()/don't() with its name captured
+MUL_PATTERN = re.compile(r"mul\((\d{1,3}),(\d{1,3})\)")
+TOGGLE_PATTERN = re.compile(r"(do(?:n't)?)\(\)")
+
+# mul(X,Y), do() and don't() over raw bytes; match.lastgroup tells the three
+# apart without comparing strings
+INSTRUCTION_PATTERN_BYTES = re.compile(
+    rb"mul\((?P<x>\d{1,3}),(?P<y>\d{1,3})\)|(?P<do>do\(\))|(?P<dont>don't\(\))"
+)
+
+# Longest instruction, mul(123,456), and bytes scanned per window
+MAX_INSTRUCTION_LENGTH = 12
+WINDOW_SIZE = 1 << 20
 
 
 def part_1(text: list[str]) -> int:
@@ -17,15 +40,16 @@ def part_1(text: list[str]) -> int:
         int: The sum of the products of all X*Y's.
     """
     final_sum = 0
-    for instr in text:
-        all_muls = re.findall("mul[(]\d{1,3},\d{1,3}[)]", instr)
-        
-        # dirty split x and y from mul(x,y), then clean extract them
-        for mul in all_muls:
-            mul_split = mul.split(",")
-            x, y = mul_split[0].split("(")[1], mul_split[1][:-1]
-            # print(f"x: {x}; y: {y}")
-            final_sum += int(x) * int(y)
+    with profiling.span("solve"):
+        for instr in text:
+            all_muls = re.findall("mul[(]\d{1,3},\d{1,3}[)]", instr)
+            
+            # dirty split x and y from mul(x,y), then clean extract them
+            for mul in all_muls:
+                mul_split = mul.split(",")
+                x, y = mul_split[0].split("(")[1], mul_split[1][:-1]
+                # print(f"x: {x}; y: {y}")
+                final_sum += int(x) * int(y)
 
     return final_sum
 
@@ -44,35 +68,209 @@ def part_2(text: list[str]) -> int:
     """
     enabled = True
     final_sum = 0
-    for instr in text:
-        # regex finds all instances of do(), don't(), and mul()
-        cmd_list = re.findall(
-            "(?:do\(\))|(?:don't\(\))|(?:mul\(\d{1,3},\d{1,3}\))",
-            instr
-        )
-        
-        # a mul()'s inclusion depends on do()'s and don't()'s
-        for command in cmd_list:
-            if command == "do()":
-                enabled = True
-            elif command == "don't()":
-                enabled = False
-            else:
-                if not enabled:
+    with profiling.span("solve"):
+        for instr in text:
+            # regex finds all instances of do(), don't(), and mul()
+            cmd_list = re.findall(
+                "(?:do\(\))|(?:don't\(\))|(?:mul\(\d{1,3},\d{1,3}\))",
+                instr
+            )
+            
+            # a mul()'s inclusion depends on do()'s and don't()'s
+            for command in cmd_list:
+                if command == "do()":
+                    enabled = True
+                elif command == "don't()":
+                    enabled = False
+                else:
+                    if not enabled:
+                        continue
+                    
+                    mul_split = command.split(",")
+                    x, y = mul_split[0].split("(")[1], mul_split[1][:-1]
+                    # print(f"x: {x}; y: {y}")
+                    final_sum += int(x) * int(y)
+
+    return final_sum
+    
+
+def evaluate(text: list[str]) -> tuple[int, int]:
+    """Computes part_1 and part_2 in a single pass with the precompiled
+    patterns. Each line is split on its do()'s and don't()'s, so every piece
+    between two toggles is either all enabled or all disabled, then the
+    operands of a piece are read straight from MUL_PATTERN's capture groups.
+
+    Args:
+        text (list[str]): The input as a list of its lines.
+
+    Returns:
+        tuple[int, int]: The part_1 and part_2 sums.
+    """
+    enabled = True
+    final_sum = 0
+    enabled_sum = 0
+    with profiling.span("solve"):
+        for instr in text:
+            # pieces alternate: memory, toggle, memory, toggle, ..., memory
+            pieces = TOGGLE_PATTERN.split(instr)
+            for i, piece in enumerate(pieces):
+                if i % 2:
+                    enabled = piece == "do"
                     continue
                 
-                mul_split = command.split(",")
-                x, y = mul_split[0].split("(")[1], mul_split[1][:-1]
-                # print(f"x: {x}; y: {y}")
-                final_sum += int(x) * int(y)
+                piece_sum = 0
+                for x, y in MUL_PATTERN.findall(piece):
+                    piece_sum += int(x) * int(y)
+                final_sum += piece_sum
+                if enabled:
+                    enabled_sum += piece_sum
+    
+    return (final_sum, enabled_sum)
 
-    return final_sum
+
+def solve_both(text: list[str]) -> tuple[int, int]:
+    """Computes part_1 and part_2 in one scan of 'text'; see evaluate.
+
+    Args:
+        text (list[str]): The input as a list of its lines.
+
+    Returns:
+        tuple[int, int]: The part_1 and part_2 sums.
+    """
+    return evaluate(text)
+
+
+def scan_range(memory, start: int,
+               stop: int) -> tuple[int, int, int, bool | None]:
+    """Scans the instructions starting in bytes [start, stop) of 'memory'
+    without knowing whether mul's are enabled when the range begins. The
+    search runs a little past 'stop', so an instruction crossing it is still
+    whole, and no instruction can start inside another, so adjacent ranges
+    never count the same match.
+
+    Args:
+        memory (mmap.mmap | bytes): The corrupted memory dump.
+        start (int): Offset of the first byte of the range.
+        stop (int): Offset just past the last byte of the range.
+
+    Returns:
+        tuple[int, int, int, bool | None]: The sum of every product, the
+        enabled sum if the range starts enabled, the enabled sum if it starts
+        disabled, and the state after the last do()/don't() (None if there is
+        none, so the starting state carries through).
+    """
+    final_sum = 0
+    leading_sum = 0  # products before the first do()/don't()
+    trailing_sum = 0  # enabled products after it
+    state = None
+    search_stop = min(stop + MAX_INSTRUCTION_LENGTH - 1, len(memory))
+    for match in INSTRUCTION_PATTERN_BYTES.finditer(memory, start, search_stop):
+        if match.start() >= stop:
+            break
+        
+        kind = match.lastgroup
+        if kind == "y":
+            product = int(match["x"]) * int(match["y"])
+            final_sum += product
+            if state is None:
+                leading_sum += product
+            elif state:
+                trailing_sum += product
+        else:
+            state = kind == "do"
     
+    return (final_sum, leading_sum + trailing_sum, trailing_sum, state)
+
+
+def combine_ranges(results, enabled: bool = True) -> tuple[int, int]:
+    """Folds scan_range results left to right into the part_1 and part_2 sums,
+    threading the do()/don't() state from each range into the next.
+
+    Args:
+        results (Iterable[tuple[int, int, int, bool | None]]): The scan_range
+        results, in file order.
+        enabled (bool): Whether mul's are enabled at the start of the first
+        range.
+
+    Returns:
+        tuple[int, int]: The part_1 and part_2 sums.
+    """
+    final_sum = 0
+    enabled_sum = 0
+    for range_sum, if_enabled_sum, if_disabled_sum, state in results:
+        final_sum += range_sum
+        enabled_sum += if_enabled_sum if enabled else if_disabled_sum
+        if state is not None:
+            enabled = state
+    
+    return (final_sum, enabled_sum)
+
+
+def scan_file(path: str, window_size: int = WINDOW_SIZE) -> tuple[int, int]:
+    """Streams the file at 'path' through mmap and computes part_1 and part_2
+    together, one fixed-size window at a time so memory stays constant.
+
+    Args:
+        path (str): Path to the corrupted memory dump.
+        window_size (int): Number of bytes scanned per window.
+
+    Returns:
+        tuple[int, int]: The part_1 and part_2 sums.
+    """
+    with loader.map_bytes(path) as memory:
+        return combine_ranges(
+            scan_range(memory, window_start, window_start + window_size)
+            for window_start in range(0, len(memory), window_size)
+        )
+
+
+def scan_chunk(path: str, start: int,
+               stop: int) -> tuple[int, int, int, bool | None]:
+    """Maps the file at 'path' and runs scan_range over [start, stop). Runs in
+    a worker process, so only the path and offsets are sent to it.
+
+    Args:
+        path (str): Path to the corrupted memory dump.
+        start (int): Offset of the first byte of the chunk.
+        stop (int): Offset just past the last byte of the chunk.
+
+    Returns:
+        tuple[int, int, int, bool | None]: See scan_range.
+    """
+    with loader.map_bytes(path) as memory:
+        return scan_range(memory, start, stop)
+
+
+def scan_file_parallel(path: str, workers: int) -> tuple[int, int]:
+    """Same as scan_file, with the file split into one chunk per worker
+    process. Each chunk is evaluated under both starting states at once, so
+    the chunks are independent and a left-to-right fold of their results
+    gives exactly the sequential answer.
+
+    Args:
+        path (str): Path to the corrupted memory dump.
+        workers (int): The number of worker processes.
+
+    Returns:
+        tuple[int, int]: The part_1 and part_2 sums.
+    """
+    size = os.path.getsize(path)
+    if not size:
+        return (0, 0)
+    
+    boundaries = sorted({size * i // workers for i in range(workers + 1)})
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(scan_chunk, [path] * (len(boundaries) - 1),
+                               boundaries[:-1], boundaries[1:])
+        return combine_ranges(results)
+
 
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("-t", "--test", action="store_true", help="Enable command line input for testing")
     parser.add_argument("-f", "--file", action="store_true", help="Enable command line input for testing")
+    parser.add_argument("-s", "--stream", action="store_true", help="Stream the input file through mmap in constant memory")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Scan the input file on N worker processes")
     args = parser.parse_args()
     
     # Part 1 and 2 w/test input
@@ -83,19 +281,31 @@ def main() -> None:
         while line:
             test_lines.append(line)
             line = input()
-        print(f"Answer for part 1 test: {part_1(test_lines)}")
-        print(f"Answer for part 2 test: {part_2(test_lines)}\n")
+        final_sum, enabled_sum = solve_both(test_lines)
+        print(f"Answer for part 1 test: {final_sum}")
+        print(f"Answer for part 2 test: {enabled_sum}\n")
         
         
-    # Part 1 and 2 w/input file
-    file_lines = []
+    # Part 1 and 2 w/input file, streamed or split across worker processes
+    if args.file and (args.stream or args.workers > 1):
+        try:
+            if args.workers > 1:
+                final_sum, enabled_sum = scan_file_parallel("input.txt",
+                                                            args.workers)
+            else:
+                final_sum, enabled_sum = scan_file("input.txt")
+            print(f"Answer for part 1 file input: {final_sum}")
+            print(f"Answer for part 2 file input: {enabled_sum}\n")
+        except FileNotFoundError:
+            print("'input.txt' does not exist in parent directory.")
+        return
+    
+    # Part 1 and 2 w/input file, in one pass
     if args.file:
         try:
-            with open("input.txt", "r") as f:
-                for line in f:
-                    file_lines.append(line.rstrip())
-            print(f"Answer for part 1 file input: {part_1(file_lines)}")
-            print(f"Answer for part 2 file input: {part_2(file_lines)}\n")
+            final_sum, enabled_sum = solve_both(loader.read_lines("input.txt"))
+            print(f"Answer for part 1 file input: {final_sum}")
+            print(f"Answer for part 2 file input: {enabled_sum}\n")
         except FileNotFoundError:
             print("'input.txt' does not exist in parent directory.")
             return
@@ -2,206 +2,419 @@
 # Solution to Advent of Code 2024 Day 4: Ceres Search
 
 import argparse
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-# grid == word search
-# num_rows == max index for rows
-# num_cols == max index for columns
+# Lets the solution run as a script from its own directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc2024 import loader, profiling
 
 
-def search_forward(i, j, grid, num_cols) -> int:
-    if j + 3 > num_cols:
-      return 0
+# The eight (row, column) steps a word can be read along
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0),
+              (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+def build_bitboards(text: list[str], letters: str = "XMAS") -> dict:
+    """Encodes every row of the grid as one Python int bitmask per letter,
+    where bit j of letter c's mask is set if column j of the row is c.
+
+    Args:
+        text (list[str]): The input as a list of its lines.
+        letters (str): The letters to build bitmasks for.
+
+    Returns:
+        dict[str, list[int]]: The row bitmasks of each letter.
+    """
+    bitboards = {}
+    for letter in set(letters):
+        # map the letter to "1" and everything else to "0", column 0 last
+        table = bytes(0x31 if byte == ord(letter) else 0x30
+                      for byte in range(256))
+        bitboards[letter] = [int(b"0" + line.encode().translate(table)[::-1], 2)
+                             for line in text]
+    return bitboards
+
+
+def count_word_bitboard(text: list[str], word: str = "XMAS",
+                        bitboards: dict | None = None) -> int:
+    """Counts 'word' in all eight directions with shifted ANDs of row
+    bitmasks. For a direction (di, dj), bit j of
+
+        row_i(word[0]) & shift(row_(i+di)(word[1]), dj) & ...
+
+    is set if 'word' starts at (i, j), so every row costs a few big-int
+    operations however wide the grid is. Backward directions are the forward
+    ones searched for the reversed word.
+
+    Args:
+        text (list[str]): The input as a list of its lines.
+        word (str): The word to search for.
+        bitboards (dict | None): The grid's bitboards, if already built with
+        at least the letters of 'word'.
+
+    Returns:
+        int: The number of times 'word' appears.
+    """
+    if bitboards is None:
+        with profiling.span("parse"):
+            bitboards = build_bitboards(text, word)
+    span = len(word) - 1
+    count = 0
+    with profiling.span("solve"):
+        for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for target in (word, word[::-1]):
+                for i in range(len(text) - span * di):
+                    matches = bitboards[target[0]][i]
+                    for k in range(1, len(word)):
+                        if not matches:
+                            break
+                        row = bitboards[target[k]][i + k * di]
+                        matches &= (row >> k if dj > 0 else
+                                    row << k if dj else row)
+                    count += matches.bit_count()
     
-    line = grid[i]
-    if line[j:j + 4] != "XMAS":
-      return 0
+    return count
+
+
+def count_cross_mas_bitboard(text: list[str],
+                             bitboards: dict | None = None) -> int:
+    """Counts the crossed mas's with shifted ANDs of row bitmasks: bit j of
+    the result for row i is set if (i, j) is an A whose two diagonals both
+    read MAS or SAM.
+
+    Args:
+        text (list[str]): The input as a list of its lines.
+        bitboards (dict | None): The grid's bitboards, if already built with
+        at least M, A and S.
+
+    Returns:
+        int: The number of crossed mas's.
+    """
+    if bitboards is None:
+        with profiling.span("parse"):
+            bitboards = build_bitboards(text, "MAS")
+    m, a, s = bitboards["M"], bitboards["A"], bitboards["S"]
+    count = 0
+    with profiling.span("solve"):
+        for i in range(1, len(text) - 1):
+            # << 1 reads column j - 1, >> 1 reads column j + 1
+            down_right = ((m[i - 1] << 1) & (s[i + 1] >> 1) |
+                          (s[i - 1] << 1) & (m[i + 1] >> 1))
+            down_left = ((m[i - 1] >> 1) & (s[i + 1] << 1) |
+                         (s[i - 1] >> 1) & (m[i + 1] << 1))
+            count += (a[i] & down_right & down_left).bit_count()
     
-    return 1
+    return count
 
 
-def search_backward(i, j, grid) -> int:
-    if j - 3 < 0:
-        return 0
+def load_grid(text: list[str]) -> "np.ndarray":
+    """Loads the word search into a 2D uint8 array of its ASCII codes.
 
-    line = grid[i]
-    if line[j - 3: j + 1] != "SAMX":
-        return 0
+    Args:
+        text (list[str]): The input as a list of its lines, all equally long.
 
-    return 1
+    Returns:
+        np.ndarray: The grid, one row per line.
+    """
+    return np.frombuffer("".join(text).encode("ascii"),
+                         dtype=np.uint8).reshape(len(text), -1)
 
 
-def search_down(i, j, grid, num_rows) -> int:
-    if i + 3 > num_rows:
-        return 0
+def count_word_numpy(grid: "np.ndarray", word: str = "XMAS") -> int:
+    """Counts 'word' in all eight directions with shifted-slice comparisons.
+    For each direction, letter k of the word is compared against the grid
+    shifted by k steps, and a cell starts a match if every comparison holds.
 
-    if (grid[i + 1][j] != "M" or
-        grid[i + 2][j] != "A" or
-        grid[i + 3][j] != "S"):
-        return 0
+    Args:
+        grid (np.ndarray): The grid from load_grid.
+        word (str): The word to search for.
 
-    return 1
+    Returns:
+        int: The number of times 'word' appears.
+    """
+    num_rows, num_cols = grid.shape
+    span = len(word) - 1
+    count = 0
+    for di, dj in DIRECTIONS:
+        # the cells 'word' can start from without running off the grid
+        row_start, row_stop = max(0, -di * span), num_rows - max(0, di * span)
+        col_start, col_stop = max(0, -dj * span), num_cols - max(0, dj * span)
+        if row_stop <= row_start or col_stop <= col_start:
+            continue
+        
+        is_match = np.ones((row_stop - row_start, col_stop - col_start),
+                           dtype=bool)
+        for k, letter in enumerate(word.encode("ascii")):
+            is_match &= grid[row_start + k * di:row_stop + k * di,
+                             col_start + k * dj:col_stop + k * dj] == letter
+        count += int(is_match.sum())
+    
+    return count
 
 
-def search_up(i, j, grid) -> int:
-    if i - 3 < 0:
-        return 0
-      
-    if (grid[i - 3][j] != "S" or
-        grid[i - 2][j] != "A" or
-        grid[i - 1][j] != "M"):
-        return 0
-      
-    return 1
+def count_cross_mas_numpy(grid: "np.ndarray") -> int:
+    """Counts every A whose two diagonals both read MAS or SAM, as one 3x3
+    pattern match over the whole grid.
 
+    Args:
+        grid (np.ndarray): The grid from load_grid.
 
-def search_diagonal_down_right(i, j, grid, num_rows, num_cols,
-                               a="M", b="A", c="S") -> int:
-    if i + 3 > num_rows or j + 3 > num_cols:
+    Returns:
+        int: The number of crossed mas's.
+    """
+    if grid.shape[0] < 3 or grid.shape[1] < 3:
         return 0
     
-    if (grid[i + 1][j + 1] != a or
-        grid[i + 2][j + 2] != b or
-        grid[i + 3][j + 3] != c):
-        return 0
-  
-    return 1
+    m, a, s = (ord(letter) for letter in "MAS")
+    top_left, bottom_right = grid[:-2, :-2], grid[2:, 2:]
+    top_right, bottom_left = grid[:-2, 2:], grid[2:, :-2]
+    is_cross = ((grid[1:-1, 1:-1] == a) &
+                (((top_left == m) & (bottom_right == s)) |
+                 ((top_left == s) & (bottom_right == m))) &
+                (((top_right == m) & (bottom_left == s)) |
+                 ((top_right == s) & (bottom_left == m))))
+    return int(is_cross.sum())
 
 
-def search_diagonal_up_right(i, j, grid, num_cols,
-                             a="M", b="A", c="S") -> int:
-    if i - 3 < 0 or j + 3 > num_cols:
-        return 0
+def build_automaton(words: list[str]) -> tuple[list, list, list]:
+    """Builds an Aho-Corasick automaton over 'words'.
 
-    if (grid[i - 1][j + 1] != a or
-        grid[i - 2][j + 2] != b or
-        grid[i - 3][j + 3] != c):
-        return 0
+    Args:
+        words (list[str]): The words to search for, without duplicates.
 
-    return 1
+    Returns:
+        tuple[list, list, list]: For every state: its goto transitions
+        (dict[str, int]), its fail state (int), and the indices into 'words'
+        of every word ending there (list[int]). State 0 is the root.
+    """
+    goto = [{}]
+    fail = [0]
+    output = [[]]
+    for index, word in enumerate(words):
+        state = 0
+        for letter in word:
+            if letter not in goto[state]:
+                goto.append({})
+                fail.append(0)
+                output.append([])
+                goto[state][letter] = len(goto) - 1
+            state = goto[state][letter]
+        output[state].append(index)
+    
+    # breadth-first, so every fail state is finished before it is used
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for letter, child in goto[state].items():
+            fallback = fail[state]
+            while fallback and letter not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[child] = goto[fallback].get(letter, 0)
+            output[child] += output[fail[child]]
+            queue.append(child)
+    
+    return (goto, fail, output)
 
 
-def search_diagonal_down_left(i, j, grid, num_rows,
-                              a="M", b="A", c="S") -> int:
-    if i + 3 > num_rows or j - 3 < 0:
-        return 0
+def grid_lines(text: list[str]) -> Iterator[str]:
+    """Yields every row, column, diagonal and anti-diagonal of the grid once,
+    each read in one direction.
 
-    if (grid[i + 1][j - 1] != a or
-        grid[i + 2][j - 2] != b or
-        grid[i + 3][j - 3] != c):
-        return 0
+    Args:
+        text (list[str]): The input as a list of its lines, all equally long.
 
-    return 1
+    Yields:
+        str: The next line of the grid.
+    """
+    num_rows = len(text)
+    num_cols = len(text[0]) if text else 0
+    yield from text
+    for column in zip(*text):
+        yield "".join(column)
+    for offset in range(-(num_rows - 1), num_cols):
+        rows = range(max(0, -offset), min(num_rows, num_cols - offset))
+        yield "".join(text[i][i + offset] for i in rows)
+    for offset in range(num_rows + num_cols - 1):
+        rows = range(max(0, offset - num_cols + 1), min(num_rows, offset + 1))
+        yield "".join(text[i][offset - i] for i in rows)
+
+
+def count_words(text: list[str], words: list[str]) -> dict[str, int]:
+    """Counts every word of 'words' in all eight directions at once. One
+    Aho-Corasick automaton is run over every grid line forwards and
+    backwards, so the cost is linear in the grid size however many words are
+    searched for.
 
+    Args:
+        text (list[str]): The input as a list of its lines, all equally long.
+        words (list[str]): The words to search for.
 
-def search_diagonal_up_left(i, j, grid, a="M", b="A", c="S") -> int:
-    if i - 3 < 0 or j - 3 < 0:
-        return 0
+    Returns:
+        dict[str, int]: The number of times each word appears.
+    """
+    words = list(dict.fromkeys(words))
+    goto, fail, output = build_automaton(words)
+    counts = [0] * len(words)
+    for line in grid_lines(text):
+        for letters in (line, reversed(line)):
+            state = 0
+            for letter in letters:
+                while state and letter not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(letter, 0)
+                for index in output[state]:
+                    counts[index] += 1
+    
+    return dict(zip(words, counts))
 
-    if (grid[i - 1][j - 1] != a or
-        grid[i - 2][j - 2] != b or
-        grid[i - 3][j - 3] != c):
-        return 0
 
-    return 1
+def count_overlapping(line: str, word: str) -> int:
+    """Counts 'word' in 'line', including occurrences that overlap."""
+    count = 0
+    i = line.find(word)
+    while i != -1:
+        count += 1
+        i = line.find(word, i + 1)
+    return count
 
 
-def search_cross_mas(i, j, grid, num_rows, num_cols) -> int:
-    if (i + 1 > num_rows or i - 1 < 0 or
-        j + 1 > num_cols or j - 1 < 0):
-        return 0
+def count_streaming(lines: Iterable[str],
+                    word: str = "XMAS") -> tuple[int, int]:
+    """Counts 'word' in all eight directions and the crossed mas's while
+    reading the grid one row at a time. Only a rolling band of the last
+    len(word) rows (3 at least, for the crosses) is kept, so memory is
+    O(columns * len(word)) however many rows the grid has.
+
+    Every match is counted once, when the band reaches its last row: rows
+    are searched as they arrive, and columns and diagonals are searched in
+    the band, forwards and backwards.
+
+    Args:
+        lines (Iterable[str]): The rows of the grid, all equally long; read
+        lazily, e.g. straight from a file.
+        word (str): The word to search for.
 
-    # M S       M M
-    #  A    or   A 
-    # M S       S S
-    if (grid[i - 1][j - 1] == "M" and grid[i + 1][j + 1] == "S"):
-        if ((grid[i + 1][j - 1] == "M" and grid[i - 1][j + 1] == "S") or
-            (grid[i + 1][j - 1] == "S" and grid[i - 1][j + 1] == "M")):
-            return 1
-          
-    # S S       S M
-    #  A    or   A 
-    # M M       S M
-    if (grid[i - 1][j - 1] == "S" and grid[i + 1][j + 1] == "M"):
-        if ((grid[i + 1][j - 1] == "M" and grid[i - 1][j + 1] == "S") or
-            (grid[i + 1][j - 1] == "S" and grid[i - 1][j + 1] == "M")):
-            return 1
-
-    return 0
-
-
-def part_1(text: list[str]) -> int:
-    """Finds all X's. For each X, it searches for XMAS in an omnidirectional
-    way.
+    Returns:
+        tuple[int, int]: The number of 'word's and of crossed mas's.
+    """
+    span = len(word) - 1
+    targets = [tuple(word), tuple(reversed(word))]
+    band = deque(maxlen=max(len(word), 3))
+    number_of_words = 0
+    number_of_crosses = 0
+    for line in lines:
+        if not line:
+            continue
+        band.append(line)
+        number_of_words += (count_overlapping(line, word) +
+                            count_overlapping(line, word[::-1]))
+        
+        # columns and diagonals, each band row shifted k * dj columns over
+        if len(band) > span:
+            rows = list(band)[-len(word):]
+            for dj in (-1, 0, 1):
+                start = span if dj < 0 else 0
+                width = len(line) - span * abs(dj)
+                shifted = [row[start + k * dj:start + k * dj + width]
+                           for k, row in enumerate(rows)]
+                for letters in zip(*shifted):
+                    number_of_words += ((letters == targets[0]) +
+                                        (letters == targets[1]))
+        
+        # crosses centered on the middle of the last three rows
+        if len(band) >= 3:
+            top, middle, bottom = band[-3], band[-2], band[-1]
+            for j in range(1, len(line) - 1):
+                if (middle[j] == "A" and
+                    {top[j - 1], bottom[j + 1]} == {"M", "S"} and
+                    {top[j + 1], bottom[j - 1]} == {"M", "S"}):
+                    number_of_crosses += 1
+    
+    return (number_of_words, number_of_crosses)
+
+
+def part_1(text: list[str], use_numpy: bool = False) -> int:
+    """Searches for XMAS in an omnidirectional way, on per-letter row
+    bitmasks (or on a NumPy grid).
 
     Args:
         text (list[str]): The input as a list of its lines.
+        use_numpy (bool): Search the whole grid at once, if NumPy is
+        installed.
 
     Returns:
         int: The number of xmas's found in a word search.
     """
-    number_of_xmas = 0
-    word_search = [line for line in text]
-    MAX_ROW_INDEX = len(word_search) - 1
-    MAX_COL_INDEX = len(word_search[0]) - 1 if MAX_ROW_INDEX else 0
-    for i, line in enumerate(word_search):
-        for j, char in enumerate(line):
-            if char == "X":
-                number_of_xmas += (search_forward(i, j,
-                                                  word_search,
-                                                  MAX_COL_INDEX) +
-                                   search_backward(i, j,
-                                                   word_search) +
-                                   search_down(i, j,
-                                               word_search,
-                                               MAX_ROW_INDEX) +
-                                   search_up(i, j,
-                                             word_search) +
-                                   search_diagonal_down_right(i, j,
-                                                              word_search,
-                                                              MAX_ROW_INDEX,
-                                                              MAX_COL_INDEX) +
-                                   search_diagonal_up_right(i, j,
-                                                            word_search,
-                                                            MAX_COL_INDEX) +
-                                   search_diagonal_down_left(i, j,
-                                                             word_search,
-                                                             MAX_ROW_INDEX) +
-                                   search_diagonal_up_left(i, j,
-                                                           word_search))
+    if use_numpy and np is not None:
+        with profiling.span("parse"):
+            grid = load_grid(text)
+        with profiling.span("solve"):
+            return count_word_numpy(grid)
     
-    return number_of_xmas
+    return count_word_bitboard(text)
 
 
-def part_2(text: list[str]) -> int:
-    """Finds all A's. For each A, it checks if a crossed is formed by two
-    mas's at that A.
+def part_2(text: list[str], use_numpy: bool = False) -> int:
+    """Finds all A's at which a cross is formed by two mas's, on per-letter
+    row bitmasks (or on a NumPy grid).
 
     Args:
         text (list[str]): The input as a list of its lines.
+        use_numpy (bool): Search the whole grid at once, if NumPy is
+        installed.
 
     Returns:
         int: The number of crossed mas's that form an X,
              found in a word search.
     """
-    number_of_xmas = 0
-    word_search = [line for line in text]
-    MAX_ROW_INDEX = len(word_search) - 1
-    MAX_COL_INDEX = len(word_search[0]) - 1 if MAX_ROW_INDEX else 0
-    for i, line in enumerate(word_search):
-        for j, char in enumerate(line):
-            if char == "A":
-                number_of_xmas += search_cross_mas(i, j, word_search,
-                                                   MAX_ROW_INDEX,
-                                                   MAX_COL_INDEX)
+    if use_numpy and np is not None:
+        with profiling.span("parse"):
+            grid = load_grid(text)
+        with profiling.span("solve"):
+            return count_cross_mas_numpy(grid)
     
-    return number_of_xmas
+    return count_cross_mas_bitboard(text)
     
 
+def solve_both(text: list[str], use_numpy: bool = False) -> tuple[int, int]:
+    """Computes part_1 and part_2 from one set of row bitmasks (or one NumPy
+    grid), since the letters of MAS are a subset of those of XMAS.
+
+    Args:
+        text (list[str]): The input as a list of its lines.
+        use_numpy (bool): Search the whole grid at once, if NumPy is
+        installed.
+
+    Returns:
+        tuple[int, int]: The number of xmas's and of crossed mas's.
+    """
+    if use_numpy and np is not None:
+        with profiling.span("parse"):
+            grid = load_grid(text)
+        with profiling.span("solve"):
+            return (count_word_numpy(grid), count_cross_mas_numpy(grid))
+    
+    with profiling.span("parse"):
+        bitboards = build_bitboards(text)
+    return (count_word_bitboard(text, bitboards=bitboards),
+            count_cross_mas_bitboard(text, bitboards))
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("-t", "--test", action="store_true", help="Enable command line input for testing")
     parser.add_argument("-f", "--file", action="store_true", help="Enable command line input for testing")
+    parser.add_argument("-n", "--numpy", action="store_true", help="Use the vectorized NumPy grid engine (falls back to pure Python if NumPy is missing)")
+    parser.add_argument("-s", "--stream", action="store_true", help="Read the input file one row at a time in bounded memory")
+    parser.add_argument("-w", "--words", help="Also count these comma-separated words in the input file")
     args = parser.parse_args()
     
     # Part 1 and 2 w/test input
@@ -212,18 +425,34 @@ def main() -> None:
         while line:
             test_lines.append(line)
             line = input()
-        print(f"Answer for part 1 test: {part_1(test_lines)}")
-        print(f"Answer for part 2 test: {part_2(test_lines)}\n")
+        number_of_xmas, number_of_crosses = solve_both(test_lines, args.numpy)
+        print(f"Answer for part 1 test: {number_of_xmas}")
+        print(f"Answer for part 2 test: {number_of_crosses}\n")
         
+    # Part 1 and 2 w/input file, streamed row by row
+    if args.file and args.stream:
+        try:
+            number_of_xmas, number_of_crosses = count_streaming(
+                loader.iter_lines("input.txt")
+            )
+            print(f"Answer for part 1 file input: {number_of_xmas}")
+            print(f"Answer for part 2 file input: {number_of_crosses}\n")
+        except FileNotFoundError:
+            print("'input.txt' does not exist in parent directory.")
+        return
+    
     # Part 1 and 2 w/input file
-    file_lines = []
     if args.file:
         try:
-            with open("input.txt", "r") as f:
-                for line in f:
-                    file_lines.append(line.rstrip())
-            print(f"Answer for part 1 file input: {part_1(file_lines)}")
-            print(f"Answer for part 2 file input: {part_2(file_lines)}\n")
+            file_lines = loader.read_lines("input.txt")
+            number_of_xmas, number_of_crosses = solve_both(file_lines,
+                                                           args.numpy)
+            print(f"Answer for part 1 file input: {number_of_xmas}")
+            print(f"Answer for part 2 file input: {number_of_crosses}\n")
+            if args.words:
+                for word, count in count_words(file_lines,
+                                               args.words.split(",")).items():
+                    print(f"Count of '{word}' in file input: {count}")
         except FileNotFoundError:
             print("'input.txt' does not exist in parent directory.")
             return
@@ -2,133 +2,495 @@
 # Solution to Advent of Code 2024 Day 5: Print Queue
 
 import argparse
-from itertools import pairwise
+import sys
+from array import array
+from collections import OrderedDict
+from functools import cmp_to_key
+from itertools import chain, pairwise
+from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-def sort_invalid(update: list[str], page_map: dict[str, list[str]]) -> None:
-    """Fixes/sorts the update to match the page ordering rules.
+# Lets the solution run as a script from its own directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc2024 import loader, profiling, snapshot
 
-    Args:
-        update (list[str]): The update to be fixed/sorted.
-        page_map (dict[str, list[str]]): The rules of which the update must
-        follow.
-    """
-    n = len(update)
-    
-    for i in range(n):
-        swapped = False
-        
-        for j in range(0, n - i - 1):
-            # Sometimes a page won't be page_map when the rules
-            # are parsed
-            if (update[j + 1] not in page_map or
-                update[j] not in page_map[update[j + 1]]):
-                update[j], update[j + 1] = update[j + 1], update[j]
-                swapped = True
 
-        if not swapped:
-            break
-
-    return
+# Default number of page sets whose order a RuleBook remembers
+CACHE_SIZE = 4096
 
 
-def part_1(text: list[str]) -> int:
-    """Parses text into two lists: page ordering rules and updates.
-    Converts the rule list into a mapping of predecessor page to its successors
-    Then, for each update, it checks every adjacent pair if there exists a
-    mapping in the map. Otherwise, it is an invalid update. Also, for all the
-    valid updates, it sums all of the middle pages together and returns it.
+def parse_rules_and_updates(
+    text: list[str]
+) -> tuple[dict[str, set[str]], list[list[str]]]:
+    """Parses text into the page ordering rules and the updates. The rules
+    become a mapping of each predecessor page to the set of its successors,
+    so checking a rule is a set lookup.
 
     Args:
         text (list[str]): The input as a list of its lines.
 
     Returns:
-        int: The sum of all middle page numbers from correctly-ordered updates.
+        tuple[dict[str, set[str]], list[list[str]]]: The rules and updates.
     """
-    answer = 0
     page_map = {}
     updates: list[list[str]] = []
-    
-    # parsing page relations and updates
     for line in text:
         if "|" in line:
             predecessor, successor = line.split("|")
-            page_map.setdefault(predecessor, []).append(successor)
+            page_map.setdefault(predecessor, set()).add(successor)
         elif "," in line:
-            update_as_list = line.split(",")
-            updates.append(update_as_list)
+            updates.append(line.split(","))
+    return (page_map, updates)
+
+
+def split_rules_and_updates(
+    text: list[str]
+) -> tuple[list[str], list[list[str]]]:
+    """Parses text into the page ordering rules and the updates, without
+    building any per-rule objects: the rules come back as one flat list of
+    their pages, split from the joined rule lines in a single call.
+
+    Args:
+        text (list[str]): The input as a list of its lines.
+
+    Returns:
+        tuple[list[str], list[list[str]]]: The rule pages, alternating
+        predecessor and successor, and the updates.
+    """
+    rule_lines = [line for line in text if "|" in line]
+    rule_pages = "|".join(rule_lines).split("|") if rule_lines else []
+    updates = [line.split(",") for line in text if "," in line]
+    return (rule_pages, updates)
 
-    # update validation
-    for update in updates:
-        is_valid = True
+
+def sort_invalid(update: list[str], page_map: dict[str, set[str]]) -> None:
+    """Fixes/sorts the update to match the page ordering rules, in place. The
+    rules are the comparator of a regular O(n log n) sort.
+
+    Args:
+        update (list[str]): The update to be fixed/sorted.
+        page_map (dict[str, set[str]]): The rules of which the update must
+        follow.
+    """
+    def compare(first: str, second: str) -> int:
+        if second in page_map.get(first, ()):
+            return -1
+        if first in page_map.get(second, ()):
+            return 1
+        return 0
+
+    update.sort(key=cmp_to_key(compare))
+    return
+
+
+class RuleBook:
+    """Answers ordering queries for many updates against one fixed set of
+    rules. The correct order of each distinct set of pages is worked out once
+    with sort_invalid and kept as a page -> position ranking in a bounded LRU
+    cache, so updates sharing the same pages only cost position lookups.
+
+    Like sort_invalid, this assumes the rules order every pair of pages that
+    appear together in an update.
+    """
+
+    def __init__(self, page_map: dict[str, set[str]],
+                 cache_size: int = CACHE_SIZE) -> None:
+        self.page_map = page_map
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._rankings: OrderedDict[frozenset[str], dict[str, int]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._rankings)
+
+    def ranking(self, update: list[str]) -> dict[str, int]:
+        """Returns the position of every page of the update in its correct
+        order, from the cache if its set of pages was seen before.
+
+        Args:
+            update (list[str]): The update to rank.
+
+        Returns:
+            dict[str, int]: The correct position of each page.
+        """
+        pages = frozenset(update)
+        ranking = self._rankings.get(pages)
+        if ranking is not None:
+            self.hits += 1
+            self._rankings.move_to_end(pages)
+            return ranking
         
-        for pair in pairwise(update):
-            first, second = pair[0], pair[1]
-            if first not in page_map or second not in page_map[first]:
-                is_valid = False
-                break
-            
-        if is_valid:
-            answer += int(update[len(update)//2]) # middle index of update
+        self.misses += 1
+        ordered = list(pages)
+        sort_invalid(ordered, self.page_map)
+        ranking = {page: position for position, page in enumerate(ordered)}
+        self._rankings[pages] = ranking
+        if len(self._rankings) > self.cache_size:
+            self._rankings.popitem(last=False)
+        return ranking
+
+    def is_ordered(self, update: list[str]) -> bool:
+        """Checks the update against its cached ranking.
+
+        Args:
+            update (list[str]): The update to check.
+
+        Returns:
+            bool: True if the update is correctly ordered.
+        """
+        ranking = self.ranking(update)
+        return all(ranking[first] < ranking[second]
+                   for first, second in pairwise(update))
+
+    def fix(self, update: list[str]) -> list[str]:
+        """Reorders the update by its cached ranking.
+
+        Args:
+            update (list[str]): The update to fix.
+
+        Returns:
+            list[str]: The update in the correct order.
+        """
+        return sorted(update, key=self.ranking(update).__getitem__)
+
+    def check(self, update: list[str]) -> tuple[bool, list[str]]:
+        """Checks the update and, if it is out of order, fixes it, with a
+        single ranking lookup, so each update counts once in hits/misses.
+
+        Args:
+            update (list[str]): The update to check.
+
+        Returns:
+            tuple[bool, list[str]]: True if the update is correctly ordered,
+            and the update in the correct order.
+        """
+        ranking = self.ranking(update)
+        if all(ranking[first] < ranking[second]
+               for first, second in pairwise(update)):
+            return (True, update)
+        return (False, sorted(update, key=ranking.__getitem__))
+
+
+class PrecedenceMatrix:
+    """The rules as a flat bit matrix over dense page IDs: bit q of row p is
+    set if a rule puts page p before page q. Rows are 'row_bytes' wide and
+    little-endian, all in one array('B'), so a check is one byte lookup and
+    nothing is a Python int as wide as the page count.
+    """
+
+    def __init__(self, pages: int, bits=None) -> None:
+        self.pages = pages
+        self.row_bytes = (pages + 7) // 8
+        self.bits = (array("B", bytes(pages * self.row_bytes)) if bits is None
+                     else bits)
+
+    def add_rules(self, rule_ids: list[int]) -> None:
+        """Sets the bits of the rules, given as page IDs alternating
+        predecessor and successor. With NumPy, this is one scattered OR.
+
+        Args:
+            rule_ids (list[int]): The rule pages as IDs.
+        """
+        row_bytes = self.row_bytes
+        if np is not None:
+            ids = np.array(rule_ids, dtype=np.int64)
+            predecessors, successors = ids[0::2], ids[1::2]
+            np.bitwise_or.at(np.frombuffer(self.bits, dtype=np.uint8),
+                             predecessors * row_bytes + (successors >> 3),
+                             (1 << (successors & 7)).astype(np.uint8))
+            return
+        
+        bits = self.bits
+        ids = iter(rule_ids)
+        for predecessor, successor in zip(ids, ids):
+            bits[predecessor * row_bytes + (successor >> 3)] |= (
+                1 << (successor & 7)
+            )
+
+
+def compile_index(
+    rule_pages: list[str], updates: list[list[str]]
+) -> tuple[list[int], PrecedenceMatrix, list[array]]:
+    """Compiles the rules once into an integer precedence index. Every page
+    is interned to a dense ID, the rules become a PrecedenceMatrix, and every
+    update becomes an array of page IDs. After this, no check hashes a
+    string.
+
+    Args:
+        rule_pages (list[str]): The rule pages, from split_rules_and_updates.
+        updates (list[list[str]]): The updates, from split_rules_and_updates.
+
+    Returns:
+        tuple[list[int], PrecedenceMatrix, list[array]]: The page number of
+        each ID, the precedence matrix, and the encoded updates.
+    """
+    pages = dict.fromkeys(chain(rule_pages, chain.from_iterable(updates)))
+    page_ids = {page: page_id for page_id, page in enumerate(pages)}
     
+    precedence = PrecedenceMatrix(len(page_ids))
+    precedence.add_rules(list(map(page_ids.__getitem__, rule_pages)))
+    
+    page_values = [int(page) for page in page_ids]
+    encoded_updates = [array("i", map(page_ids.__getitem__, update))
+                       for update in updates]
+    return (page_values, precedence, encoded_updates)
+
+
+def is_ordered_encoded(update: array, precedence: PrecedenceMatrix) -> bool:
+    """Checks that every adjacent pair of the update has a rule putting the
+    first page before the second, as byte lookups in the precedence matrix.
+
+    Args:
+        update (array): The update as page IDs, from compile_index.
+        precedence (PrecedenceMatrix): The compiled rules.
+
+    Returns:
+        bool: True if the update is correctly ordered.
+    """
+    bits, row_bytes = precedence.bits, precedence.row_bytes
+    for first, second in pairwise(update):
+        if not bits[first * row_bytes + (second >> 3)] >> (second & 7) & 1:
+            return False
+    return True
+
+
+def sort_encoded(update: array, precedence: PrecedenceMatrix) -> list[int]:
+    """Orders the update by the rules. With a rule between every pair of its
+    pages, a page's position is the number of its pages it must come before,
+    counted from the back. That is one AND and a bit count per page, of its
+    row against a mask of the update's pages, both cut to the byte columns
+    the update's page IDs span.
+
+    Args:
+        update (array): The update as page IDs, from compile_index.
+        precedence (PrecedenceMatrix): The compiled rules.
+
+    Returns:
+        list[int]: The page IDs in order.
+    """
+    if not update:
+        return []
+    bits, row_bytes = precedence.bits, precedence.row_bytes
+    low = min(update) >> 3
+    high = (max(update) >> 3) + 1
+    mask = bytearray(high - low)
+    for page in update:
+        mask[(page >> 3) - low] |= 1 << (page & 7)
+    pages = int.from_bytes(mask, "little")
+    
+    def successors_in_update(page: int) -> int:
+        base = page * row_bytes
+        return (int.from_bytes(bits[base + low:base + high], "little") &
+                pages).bit_count()
+    
+    return sorted(update, key=lambda page: -successors_in_update(page))
+
+
+def index_to_buffers(page_values: list[int], precedence: PrecedenceMatrix,
+                     encoded_updates: list[array]) -> list[array]:
+    """Flattens a compile_index result into typed buffers for a snapshot:
+    the page numbers, the precedence bit matrix, and every update's page IDs
+    with an offsets index.
+
+    Args:
+        page_values (list[int]): The page number of each ID.
+        precedence (PrecedenceMatrix): The compiled rules.
+        encoded_updates (list[array]): The updates as page IDs.
+
+    Returns:
+        list[array]: The buffers, for index_from_buffers.
+    """
+    update_pages = array("i")
+    update_offsets = array("q", [0])
+    for update in encoded_updates:
+        update_pages.extend(update)
+        update_offsets.append(len(update_pages))
+    return [array("q", page_values), precedence.bits, update_pages,
+            update_offsets]
+
+
+def index_from_buffers(buffers: list) -> tuple[list[int], PrecedenceMatrix,
+                                               list]:
+    """Rebuilds a compile_index result from index_to_buffers buffers. The
+    precedence matrix and the updates stay views into the buffers.
+
+    Args:
+        buffers (list[array] | list[memoryview]): The flattened index.
+
+    Returns:
+        tuple[list[int], PrecedenceMatrix, list]: See compile_index.
+    """
+    page_values, matrix, update_pages, update_offsets = buffers
+    precedence = PrecedenceMatrix(len(page_values), matrix)
+    encoded_updates = [update_pages[start:stop] for start, stop in
+                       zip(update_offsets, update_offsets[1:])]
+    return (list(page_values), precedence, encoded_updates)
+
+
+def load_index(path: str) -> tuple[list[int], PrecedenceMatrix, list]:
+    """Compiles the rules and updates of the file at 'path', or loads them
+    from its binary snapshot when one is up to date.
+
+    Args:
+        path (str): Path to the input file.
+
+    Returns:
+        tuple[list[int], PrecedenceMatrix, list]: See compile_index.
+    """
+    def build() -> list[array]:
+        rule_pages, updates = split_rules_and_updates(loader.read_lines(path))
+        return index_to_buffers(*compile_index(rule_pages, updates))
+
+    return index_from_buffers(snapshot.load_or_build(path, "day05", build))
+
+
+def sum_valid_middles(page_values: list[int], precedence: PrecedenceMatrix,
+                      encoded_updates: list) -> int:
+    """Sums the middle pages of the correctly-ordered updates of a compiled
+    index.
+
+    Args:
+        page_values (list[int]): The page number of each ID.
+        precedence (PrecedenceMatrix): The compiled rules.
+        encoded_updates (list[array]): The updates as page IDs.
+
+    Returns:
+        int: The sum of all middle page numbers from correctly-ordered updates.
+    """
+    answer = 0
+    with profiling.span("solve"):
+        for update in encoded_updates:
+            if is_ordered_encoded(update, precedence):
+                answer += page_values[update[len(update)//2]] # middle index
     return answer
 
 
-def part_2(text: list[str]) -> int:
-    """Parses text into two lists: page ordering rules and updates. Converts
-    the rule list into a mapping of predecessor page to its successors.
-    Also creates a mapping of each page to a list of the number of pages before
-    and the number of pages after the specifed page. Then, for each update, it
-    checks every adjacent pair if there exists a mapping in the map. Otherwise,
-    it is an invalid update. For each invalid update that is found, it will add
-    its "middle" value to the total sum that will be returned.
+def sum_fixed_middles(page_values: list[int], precedence: PrecedenceMatrix,
+                      encoded_updates: list) -> int:
+    """Fixes the invalid updates of a compiled index and sums their middle
+    pages.
 
     Args:
-        text (list[str]): The input as a list of its lines.
+        page_values (list[int]): The page number of each ID.
+        precedence (PrecedenceMatrix): The compiled rules.
+        encoded_updates (list[array]): The updates as page IDs.
 
     Returns:
         int: The sum of all middle page numbers from all invalid updates.
     """
     answer = 0
-    page_map = {}
-    updates: list[list[str]] = []
-    invalid_updates: list[list[str]] = []
-    
-    # parsing page relations and updates
-    for line in text:
-        if "|" in line:
-            predecessor, successor = line.split("|")
-            page_map.setdefault(predecessor, set()).add(successor)
-        elif "," in line:
-            update_as_list = line.split(",")
-            updates.append(update_as_list)
+    with profiling.span("solve"):
+        invalid_updates = [update for update in encoded_updates
+                           if not is_ordered_encoded(update, precedence)]
+    with profiling.span("sort"):
+        for update in invalid_updates:
+            fixed_update = sort_encoded(update, precedence)
+            answer += page_values[fixed_update[len(fixed_update)//2]]
+    return answer
 
 
-    # update validation
-    for update in updates:
-        is_valid = True
-        
-        for pair in pairwise(update):
-            first, second = pair[0], pair[1]
-            if first not in page_map or second not in page_map[first]:
-                is_valid = False
-                break
-            
-        # find the middle of the invalid update
-        if not is_valid:
-            invalid_updates.append(update)
-
-    for update in invalid_updates:
-        sort_invalid(update, page_map)
-        answer += int(update[len(update)//2])
+def sum_middles(page_values: list[int], precedence: PrecedenceMatrix,
+                encoded_updates: list) -> tuple[int, int]:
+    """Checks every update of a compiled index once, summing the middle pages
+    of the correctly-ordered ones and of the fixed invalid ones.
+
+    Args:
+        page_values (list[int]): The page number of each ID.
+        precedence (PrecedenceMatrix): The compiled rules.
+        encoded_updates (list[array]): The updates as page IDs.
+
+    Returns:
+        tuple[int, int]: The sums of sum_valid_middles and sum_fixed_middles.
+    """
+    valid_sum = 0
+    invalid_updates = []
+    with profiling.span("solve"):
+        for update in encoded_updates:
+            if is_ordered_encoded(update, precedence):
+                valid_sum += page_values[update[len(update)//2]]
+            else:
+                invalid_updates.append(update)
     
-    return answer
+    fixed_sum = 0
+    with profiling.span("sort"):
+        for update in invalid_updates:
+            fixed_update = sort_encoded(update, precedence)
+            fixed_sum += page_values[fixed_update[len(fixed_update)//2]]
+    return (valid_sum, fixed_sum)
+
+
+def part_1(text: list[str]) -> int:
+    """Parses text into two lists: page ordering rules and updates, and
+    compiles them into an integer precedence index. Then, for each update, it
+    checks every adjacent pair if there exists a mapping in the index.
+    Otherwise, it is an invalid update. Also, for all the valid updates, it
+    sums all of the middle pages together and returns it.
+
+    Args:
+        text (list[str]): The input as a list of its lines.
+
+    Returns:
+        int: The sum of all middle page numbers from correctly-ordered updates.
+    """
+    with profiling.span("parse"):
+        rule_pages, updates = split_rules_and_updates(text)
+    with profiling.span("compile"):
+        index = compile_index(rule_pages, updates)
+    return sum_valid_middles(*index)
+
+
+def part_2(text: list[str]) -> int:
+    """Parses text into two lists: page ordering rules and updates, and
+    compiles them into an integer precedence index. Then, for each update, it
+    checks every adjacent pair if there exists a mapping in the index.
+    Otherwise, it is an invalid update. Each invalid update is sorted by the
+    rules, and its "middle" value is added to the total sum that will be
+    returned.
+
+    Args:
+        text (list[str]): The input as a list of its lines.
+
+    Returns:
+        int: The sum of all middle page numbers from all invalid updates.
+    """
+    with profiling.span("parse"):
+        rule_pages, updates = split_rules_and_updates(text)
+    with profiling.span("compile"):
+        index = compile_index(rule_pages, updates)
+    return sum_fixed_middles(*index)
+
+
+def solve_both(text: list[str]) -> tuple[int, int]:
+    """Parses and compiles the rules and updates once, then answers both
+    parts in one pass over the updates; see sum_middles.
+
+    Args:
+        text (list[str]): The input as a list of its lines.
+
+    Returns:
+        tuple[int, int]: The sum of the middle pages of the correctly-ordered
+        updates, and of the fixed invalid updates.
+    """
+    with profiling.span("parse"):
+        rule_pages, updates = split_rules_and_updates(text)
+    with profiling.span("compile"):
+        index = compile_index(rule_pages, updates)
+    return sum_middles(*index)
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("-t", "--test", action="store_true", help="Enable command line input for testing")
     parser.add_argument("-f", "--file", action="store_true", help="Enable command line input for testing")
+    parser.add_argument("-s", "--snapshot", action="store_true", help="Load the compiled rules and updates of the input file from their binary snapshot, saving one if needed")
+    parser.add_argument("-c", "--cache-size", type=int, help="Answer the input file through a RuleBook with this cache size, and report its hits/misses")
     args = parser.parse_args()
     
     # Part 1 and 2 w/test input
@@ -140,18 +502,51 @@ def main() -> None:
             if line == "\\q":
                 break
             test_lines.append(line)
-        print(f"Answer for part 1 test: {part_1(test_lines)}")
-        print(f"Answer for part 2 test: {part_2(test_lines)}\n")
+        valid_sum, fixed_sum = solve_both(test_lines)
+        print(f"Answer for part 1 test: {valid_sum}")
+        print(f"Answer for part 2 test: {fixed_sum}\n")
         
+    # Part 1 and 2 w/input file, through a RuleBook
+    if args.file and args.cache_size is not None:
+        try:
+            page_map, updates = parse_rules_and_updates(
+                loader.read_lines("input.txt")
+            )
+        except FileNotFoundError:
+            print("'input.txt' does not exist in parent directory.")
+            return
+        
+        rule_book = RuleBook(page_map, args.cache_size)
+        valid_sum = 0
+        fixed_sum = 0
+        for update in updates:
+            is_valid, fixed_update = rule_book.check(update)
+            middle = int(fixed_update[len(fixed_update)//2])
+            if is_valid:
+                valid_sum += middle
+            else:
+                fixed_sum += middle
+        print(f"Answer for part 1 file input: {valid_sum}")
+        print(f"Answer for part 2 file input: {fixed_sum}")
+        print(f"RuleBook cache: {rule_book.hits} hits, {rule_book.misses} misses\n")
+        return
+    
+    # Part 1 and 2 w/input file, from its compiled snapshot
+    if args.file and args.snapshot:
+        try:
+            valid_sum, fixed_sum = sum_middles(*load_index("input.txt"))
+            print(f"Answer for part 1 file input: {valid_sum}")
+            print(f"Answer for part 2 file input: {fixed_sum}\n")
+        except FileNotFoundError:
+            print("'input.txt' does not exist in parent directory.")
+        return
+    
     # Part 1 and 2 w/input file
-    file_lines = []
     if args.file:
         try:
-            with open("input.txt", "r") as f:
-                for line in f:
-                    file_lines.append(line.rstrip())
-            print(f"Answer for part 1 file input: {part_1(file_lines)}")
-            print(f"Answer for part 2 file input: {part_2(file_lines)}\n")
+            valid_sum, fixed_sum = solve_both(loader.read_lines("input.txt"))
+            print(f"Answer for part 1 file input: {valid_sum}")
+            print(f"Answer for part 2 file input: {fixed_sum}\n")
         except FileNotFoundError:
             print("'input.txt' does not exist in parent directory.")
             return